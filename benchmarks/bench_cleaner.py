@@ -0,0 +1,75 @@
+"""
+Benchmark of the removal of a tree of small files by "os.remove_trees".
+
+Builds a tree of empty files (1,000,000 by default) spread over folders, and measures
+the time to remove it with "shutil.rmtree", with the previous "cleaner(level=2)" (one
+pool per folder, each waiting for its single "rmtree") and with "remove_trees".
+
+Usage:
+
+    python -m benchmarks.bench_cleaner [--files 1000000] [--per-folder 1000] [--workers 8]
+"""
+
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+from shutil import rmtree
+from time import perf_counter
+
+from snakypy.helpers.os import remove_trees
+
+
+def build(root: str, files: int, per_folder: int) -> list:
+    """Creates the tree: top-level folders, each with subfolders of "per_folder" files."""
+    tops = [join(root, f"top{i}") for i in range(8)]
+    folders = -(-files // per_folder)
+    for index in range(folders):
+        folder = join(tops[index % len(tops)], f"sub{index // 10}", f"dir{index}")
+        os.makedirs(folder)
+        for number in range(min(per_folder, files - index * per_folder)):
+            os.close(os.open(join(folder, f"f{number}"), os.O_CREAT | os.O_WRONLY))
+    return tops
+
+
+def legacy_cleaner(directory: str) -> None:
+    for r, d, f in os.walk(directory, topdown=False):
+        for item in d:
+            with ThreadPoolExecutor() as executor:
+                executor.submit(rmtree, join(r, item))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=1000000)
+    parser.add_argument("--per-folder", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    methods = {
+        "shutil.rmtree": lambda root, tops: [rmtree(top) for top in tops],
+        "cleaner (legacy)": lambda root, tops: legacy_cleaner(root),
+        "remove_trees": lambda root, tops: remove_trees(
+            *tops, max_workers=args.workers
+        ),
+    }
+    print(f"{args.files} files, {args.per_folder} per folder\n")
+    print(f"{'method':>18} {'build (s)':>10} {'remove (s)':>11} {'files/s':>10}")
+    for name, method in methods.items():
+        root = tempfile.mkdtemp()
+        start = perf_counter()
+        tops = build(root, args.files, args.per_folder)
+        built = perf_counter() - start
+        start = perf_counter()
+        method(root, tops)
+        elapsed = perf_counter() - start
+        assert os.listdir(root) == []
+        os.rmdir(root)
+        print(
+            f"{name:>18} {built:>10.2f} {elapsed:>11.2f} {args.files / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
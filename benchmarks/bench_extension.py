@@ -0,0 +1,58 @@
+"""
+Benchmark of "catches.extensions" (batch) against "catches.extension" (per call).
+
+The per-call loop needs a try/except around each file, since "extension" raises
+"TypeError" for names without extension.
+
+Usage:
+
+    python -m benchmarks.bench_extension [--paths 1000000] [--repeat 3]
+"""
+
+import argparse
+from timeit import repeat
+
+from snakypy.helpers.catches import extension, extensions
+
+SAMPLES = (
+    "/home/user/project/src/module.py",
+    "/var/log/syslog.1.gz",
+    "/home/user/.bashrc",
+    "/usr/bin/python3",
+    "/tmp/archive.tar.gz",
+)
+
+
+def per_call(paths: list, dots: bool) -> list:
+    result = []
+    for path in paths:
+        try:
+            result.append(extension(path, dots=dots))
+        except TypeError:
+            result.append(None)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paths", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [SAMPLES[i % len(SAMPLES)] for i in range(args.paths)]
+    print(f"{args.paths} paths\n")
+    print(f"{'mode':>10} {'per call (s)':>13} {'batch (s)':>10} {'speedup':>8}")
+    for dots in (False, True):
+        assert per_call(paths[:100], dots) == extensions(paths[:100], dots)
+        single = min(
+            repeat(lambda: per_call(paths, dots), number=1, repeat=args.repeat)
+        )
+        batch = min(
+            repeat(lambda: extensions(paths, dots), number=1, repeat=args.repeat)
+        )
+        mode = "dots" if dots else "default"
+        print(f"{mode:>10} {single:>13.4f} {batch:>10.4f} {single / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
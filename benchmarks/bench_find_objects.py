@@ -0,0 +1,78 @@
+"""
+Benchmark of "catches.find_objects" by number of extensions requested.
+
+The previous engine walked the whole tree once per extension, so its time grows
+linearly with the number of extensions. The current engine walks the tree once.
+
+Usage:
+
+    python -m benchmarks.bench_find_objects [--files 50000] [--repeat 3]
+"""
+
+import argparse
+from os import makedirs, walk
+from os.path import join
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+from snakypy.helpers.catches import find_objects
+
+EXTENSIONS = ("txt", "json", "py", "log", "md", "toml", "cfg", "ini")
+
+
+def legacy_find_by_extension(directory: str, by_extension: tuple) -> list:
+    """Engine used before the single-pass walk (one "os.walk" per extension)."""
+    found = []
+    for ext in by_extension:
+        for root_, directory_, files_ in walk(directory):
+            for file in files_:
+                if file.endswith(ext):
+                    found.append(join(root_, file))
+    return found
+
+
+def build_tree(root: str, total: int, per_folder: int = 100) -> None:
+    for index in range(total):
+        folder = join(root, f"d{index // per_folder // 10}", f"d{index // per_folder}")
+        if index % per_folder == 0:
+            makedirs(folder, exist_ok=True)
+        ext = EXTENSIONS[index % len(EXTENSIONS)]
+        with open(join(folder, f"f{index}.{ext}"), "w"):
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        build_tree(tmp, args.files)
+        print(f"Tree with {args.files} files\n")
+        print(
+            f"{'extensions':>10} {'legacy (s)':>12} {'single-pass (s)':>16} {'speedup':>8}"
+        )
+        for count in range(1, len(EXTENSIONS) + 1):
+            exts = EXTENSIONS[:count]
+            legacy = min(
+                repeat(
+                    lambda: legacy_find_by_extension(tmp, exts),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            current = min(
+                repeat(
+                    lambda: find_objects(tmp, by_extension=exts),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(
+                f"{count:>10} {legacy:>12.4f} {current:>16.4f} {legacy / current:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the import time of "snakypy.helpers", measured with "python -X importtime".
+
+Each statement runs in a new interpreter, several times, and the best cumulative time
+of the "snakypy" modules is reported, with the slowest modules imported. With
+"--max-ms", the exit status is 1 if any statement is slower than the limit, so the CI
+fails on a regression. With "--output", the results are saved as JSON to be tracked.
+
+Usage:
+
+    python -m benchmarks.bench_import [--repeat 5] [--max-ms 100] [--output import-time.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+STATEMENTS = (
+    "import snakypy.helpers",
+    "from snakypy.helpers import printer",
+    "from snakypy.helpers.files import read_json",
+    "from snakypy.helpers.catches import find_objects",
+)
+
+
+def importtime(statement: str) -> list:
+    """
+    Returns the modules imported, in the order of "-X importtime": tuples (name,
+    cumulative time in microseconds, True if imported directly by the statement).
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            # The nested imports are indented by two more spaces.
+            modules.append((name.strip(), int(cumulative), not name.startswith("  ")))
+    return modules
+
+
+def measure(statement: str, startup: set) -> tuple:
+    """Total time, in microseconds, and modules imported by the statement."""
+    modules = [m for m in importtime(statement) if m[0] not in startup]
+    return sum(us for _, us, top in modules if top), modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("statements", nargs="*", default=STATEMENTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules shown.")
+    parser.add_argument("--max-ms", type=float, help="Limit of each statement.")
+    parser.add_argument("--output", help="JSON file where the results are saved.")
+    args = parser.parse_args()
+
+    # Modules imported by the interpreter itself, before the statement.
+    startup = {name for name, _, _ in importtime("pass")}
+    results = {}
+    for statement in args.statements:
+        total, modules = min(
+            (measure(statement, startup) for _ in range(args.repeat)),
+            key=lambda run: run[0],
+        )
+        results[statement] = {"ms": total / 1000, "modules": len(modules)}
+        print(f"{statement}\n    {total / 1000:.1f} ms, {len(modules)} modules")
+        slowest = sorted(modules, key=lambda module: module[1], reverse=True)
+        for name, us, _ in slowest[: args.top]:
+            print(f"    {us / 1000:>7.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_ms is not None:
+        slow = [s for s, result in results.items() if result["ms"] > args.max_ms]
+        for statement in slow:
+            print(f"{statement!r} took more than {args.max_ms} ms", file=sys.stderr)
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
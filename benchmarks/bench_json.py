@@ -0,0 +1,82 @@
+"""
+Benchmark of the JSON backends of "snakypy.helpers.files" by document size.
+
+Measures the throughput, in MB/s of JSON text, of "loads" and of "dumps" with the
+indentation of "create_json" and with the compact output, for each backend installed.
+
+Usage:
+
+    python -m benchmarks.bench_json [--sizes 100 10000 500000] [--repeat 3]
+"""
+
+import argparse
+from timeit import repeat
+
+from snakypy.helpers.files import JSON_BACKENDS, set_json_backend
+
+
+def document(records: int) -> list:
+    return [
+        {
+            "id": i,
+            "name": f"user {i}",
+            "email": f"user{i}@example.com",
+            "active": i % 3 == 0,
+            "score": i * 0.25,
+            "tags": ["admin", "dev"] if i % 5 == 0 else ["user"],
+            "address": {"city": "Brasília", "zip": f"{70000 + i % 1000}-000"},
+        }
+        for i in range(records)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 10000, 500000], help="Records."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = []
+    for name in JSON_BACKENDS:
+        try:
+            backends.append(set_json_backend(name))
+        except ImportError:
+            print(f"{name} is not installed")
+    set_json_backend()
+
+    print(
+        f"\n{'backend':>8} {'records':>8} {'size (MB)':>10} {'loads':>8} "
+        f"{'dumps':>8} {'compact':>8} {'disk':>6}"
+    )
+    for records in args.sizes:
+        data = document(records)
+        for backend in backends:
+            pretty = backend.dumps(data, 4)
+            compact = backend.dumps(data, None)
+            assert backend.loads(pretty.encode()) == backend.loads(compact.encode())
+            raw = pretty.encode()
+            mb = len(raw) / (1024 * 1024)
+            number = max(1, 1000 // records)
+
+            def rate(function) -> float:
+                best = min(repeat(function, number=number, repeat=args.repeat))
+                return mb * number / best
+
+            loads = rate(lambda: backend.loads(raw))
+            dumps = rate(lambda: backend.dumps(data, 4))
+            dumps_compact = rate(lambda: backend.dumps(data, None))
+            # Size of the compact output relative to the indented one.
+            disk = len(compact) / len(pretty)
+            print(
+                f"{backend.name:>8} {records:>8} {mb:>10.2f} {loads:>8.1f} "
+                f"{dumps:>8.1f} {dumps_compact:>8.1f} {disk:>5.0%}"
+            )
+    print(
+        "\nloads, dumps and compact in MB/s; disk is the compact size / indented size"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of "files.json_transaction" with N processes incrementing the same counter.
+
+For each number of processes, measures the contended throughput (transactions per
+second) and checks that no update was lost. The same cycle without the lock, with
+"read_json" and "update_json", is shown for comparison, with its lost updates.
+
+Usage:
+
+    python -m benchmarks.bench_json_lock [--processes 1 2 4 8] [--increments 200]
+"""
+
+import argparse
+import os
+import tempfile
+from multiprocessing import Process
+from time import perf_counter
+
+from snakypy.helpers.files import (
+    create_json,
+    json_transaction,
+    read_json,
+    update_json,
+)
+
+
+def locked(path: str, increments: int) -> None:
+    for _ in range(increments):
+        with json_transaction(path) as data:
+            data["counter"] += 1
+
+
+def unlocked(path: str, increments: int) -> None:
+    for _ in range(increments):
+        data = read_json(path)
+        data["counter"] += 1
+        update_json(path, data, atomic=True)
+
+
+def run(worker, path: str, processes: int, increments: int) -> tuple:
+    create_json({"counter": 0}, path, force=True)
+    workers = [
+        Process(target=worker, args=(path, increments)) for _ in range(processes)
+    ]
+    start = perf_counter()
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    elapsed = perf_counter() - start
+    expected = processes * increments
+    return expected / elapsed, expected - read_json(path)["counter"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--increments", type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "counter.json")
+    print(f"{args.increments} increments per process\n")
+    print(
+        f"{'processes':>9} {'locked (tx/s)':>14} {'lost':>5} {'unlocked (tx/s)':>16} {'lost':>5}"
+    )
+    for processes in args.processes:
+        rate, lost = run(locked, path, processes, args.increments)
+        assert lost == 0
+        rate_unlocked, lost_unlocked = run(unlocked, path, processes, args.increments)
+        print(
+            f"{processes:>9} {rate:>14.0f} {lost:>5} "
+            f"{rate_unlocked:>16.0f} {lost_unlocked:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,19 +11,69 @@ For more information, access: 'https://github.com/snakypy/snakypy-helpers'
 :copyright: Copyright 2020-2021 by Snakypy team, see AUTHORS.rst.
 :license: MIT license, see LICENSE for details.
 """
+
+from importlib import import_module
+from os import environ
 from os.path import abspath, dirname, join
+from typing import TYPE_CHECKING, Any, List
+
+# The subpackages and the shortcuts below are only imported when first accessed
+# (PEP 562), so "from snakypy.helpers import printer" loads only the console.
+_SUBMODULES = (
+    "ansi",
+    "calcs",
+    "catches",
+    "checking",
+    "console",
+    "decorators",
+    "files",
+    "logging",
+    "os",
+    "path",
+    "subprocess",
+)
+_SHORTCUTS = {
+    "BG": "ansi",
+    "FG": "ansi",
+    "NONE": "ansi",
+    "SGR": "ansi",
+    "entry": "console",
+    "pick": "console",
+    "printer": "console",
+    "eqversion": "files",
+}
+
+if TYPE_CHECKING:
+    from snakypy.helpers import (  # noqa: F401
+        ansi,
+        calcs,
+        catches,
+        checking,
+        console,
+        decorators,
+        files,
+        logging,
+        os,
+        path,
+        subprocess,
+    )
+    from snakypy.helpers.ansi import BG, FG, NONE, SGR  # noqa: F401
+    from snakypy.helpers.console import entry, pick, printer  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return import_module(f"{__name__}.{name}")
+    if name in _SHORTCUTS:
+        value = getattr(import_module(f"{__name__}.{_SHORTCUTS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_SHORTCUTS))
 
-import snakypy.helpers.ansi  # noqa: F401
-import snakypy.helpers.calcs
-import snakypy.helpers.catches
-import snakypy.helpers.console
-import snakypy.helpers.decorators
-import snakypy.helpers.files
-import snakypy.helpers.os
-import snakypy.helpers.path  # noqa: F401
-from snakypy.helpers.ansi import BG, FG, NONE, SGR  # noqa: F401
-from snakypy.helpers.console import entry, pick, printer  # noqa: F401
-from snakypy.helpers.files import eqversion
 
 __info__ = {
     "name": "Snakypy Organization",
@@ -34,6 +84,22 @@ __info__ = {
     "version": "0.3.1",
 }
 
-# Keep the versions the same on pyproject.toml and __init__.py
-pyproject = join(dirname(abspath(__file__)), "../..", "pyproject.toml")
-eqversion(pyproject, __info__["version"])
+
+def sync_version() -> None:
+    """
+    Keeps the version of the "pyproject.toml" of the repository the same as the
+    version of "__info__". It is a development hook, run by "python -m snakypy.helpers"
+    in the build and test commands of ".imake". Importing the package does not touch
+    any file, unless the environment variable "SNAKYPY_HELPERS_SYNC_VERSION" is set.
+    """
+    from snakypy.helpers.files import eqversion
+
+    pyproject = join(dirname(abspath(__file__)), "../..", "pyproject.toml")
+    eqversion(pyproject, __info__["version"])
+
+
+__all__ = [*_SUBMODULES, *_SHORTCUTS, "sync_version"]
+
+
+if environ.get("SNAKYPY_HELPERS_SYNC_VERSION"):
+    sync_version()
@@ -1 +1,3 @@
-import snakypy.helpers
+from snakypy.helpers import sync_version
+
+sync_version()
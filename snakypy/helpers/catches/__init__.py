@@ -1,2 +1,13 @@
-from .finders import find_objects, is_tool, tools_requirements
-from .generic import extension
+from .filters import PathFilter, read_ignore_file
+from .finders import (
+    ObjectMatch,
+    clear_tools_cache,
+    extension_histogram,
+    find_objects,
+    find_objects_parallel,
+    find_tools,
+    is_tool,
+    iter_objects,
+    tools_requirements,
+)
+from .generic import extension, extensions
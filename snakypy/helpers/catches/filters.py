@@ -0,0 +1,202 @@
+import re
+from typing import Iterable, List, Optional, Pattern
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translates a glob in the ".gitignore" syntax to a regular expression that must
+    match the whole relative path. The paths of folders end with a "/".
+    """
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                if i + 2 == n:
+                    # "foo/**": everything inside "foo".
+                    out.append(".*")
+                    i += 2
+                    continue
+                if pattern[i + 2] == "/":
+                    # "**/foo" and "foo/**/bar": zero or more folders.
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append("[^/]*")
+            continue
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            # A "]" right after the opening (or after the negation) is a literal.
+            opening = i + 1
+            first = opening + 1 if pattern.startswith(("!", "^"), opening) else opening
+            end = pattern.find("]", first + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                chars = pattern[opening:end].replace("\\", "\\\\")
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+                out.append(f"[{chars}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 1
+        else:
+            out.append(re.escape(c))
+        i += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    suffix = "/" if dir_only else "/?"
+    return prefix + "".join(out) + suffix + r"\Z"
+
+
+def read_ignore_file(file_path: str) -> List[str]:
+    """
+    Reads the patterns of a file in the ".gitignore" format, discarding blank lines
+    and comments.
+
+    >>> from snakypy.helpers.catches.filters import read_ignore_file
+    >>> read_ignore_file(".gitignore")
+    ['*.py[cod]', 'build/', 'dist/', '.tox/']
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+    Returns:
+        [list] -- The list of patterns in the order of the file.
+    """
+    patterns = []
+    with open(file_path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            patterns.append(line)
+    return patterns
+
+
+def _compile(globs: Iterable[str]) -> Optional[Pattern]:
+    """
+    Compiles every glob in a single regular expression. The alternatives are placed
+    in reverse order, so the last pattern that matches is the one that decides, as in
+    ".gitignore". The name of each group tells whether its pattern is a negation.
+    """
+    alternatives = []
+    for pattern in globs:
+        negated = pattern.startswith("!")
+        if pattern.startswith(("!", "\\!", "\\#")):
+            pattern = pattern[1:]
+        alternatives.append(("n" if negated else "p", _translate(pattern)))
+    if not alternatives:
+        return None
+    groups = [
+        f"(?P<{kind}{index}>{regex})"
+        for index, (kind, regex) in reversed(list(enumerate(alternatives)))
+    ]
+    return re.compile("|".join(groups), re.DOTALL)
+
+
+class PathFilter:
+    """
+    Filter of paths by inclusion and exclusion patterns, used by the search functions
+    of "snakypy.helpers.catches". All the patterns are compiled only once, with the globs
+    in one regular expression for the inclusions and one for the exclusions.
+
+    The patterns are matched against the path relative to the root of the search,
+    always separated by "/". The globs follow the ".gitignore" syntax: a pattern
+    without "/" matches the name at any depth, a pattern with "/" is anchored at the
+    root, a trailing "/" matches only folders, "**" matches any number of folders and
+    "!" negates a previous exclusion. The excluded folders are not traversed.
+
+    The regular expressions are searched in the relative path, as "re.search". They are
+    compiled one by one, apart from the globs, so they can use backreferences and named
+    groups freely, but they cannot be negated by a "!" glob: a path that matches an
+    exclusion regex is always excluded.
+
+    >>> from snakypy.helpers.catches import PathFilter, find_objects
+    >>> filters = PathFilter(exclude=(".git", "node_modules", "venv/"), ignore_files=(".gitignore",))
+    >>> find_objects(".", by_extension=("py",), filters=filters)
+
+    Args:
+        include (tuple): Globs of the files to be kept. If empty, all the files are kept.
+
+        exclude (tuple): Globs of the files and folders to be discarded.
+
+        include_regex (tuple): Regular expressions of the files to be kept.
+
+        exclude_regex (tuple): Regular expressions of the files and folders to be discarded.
+
+        ignore_files (tuple): Paths of files in the ".gitignore" format, whose patterns are
+                              added to the exclusions.
+    """
+
+    def __init__(
+        self,
+        include: tuple = (),
+        exclude: tuple = (),
+        *,
+        include_regex: tuple = (),
+        exclude_regex: tuple = (),
+        ignore_files: tuple = (),
+    ):
+        exclude_globs = list(exclude)
+        for file in ignore_files:
+            exclude_globs.extend(read_ignore_file(file))
+        self._include = _compile(include)
+        self._exclude = _compile(exclude_globs)
+        self._include_regex = tuple(re.compile(regex) for regex in include_regex)
+        self._exclude_regex = tuple(re.compile(regex) for regex in exclude_regex)
+
+    def excluded(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Checks if a relative path is excluded.
+
+        Args:
+            path (str): Path relative to the root of the search, separated by "/".
+
+            is_dir (bool): Must be True if the path is a folder. (Default: False)
+
+        Returns:
+            [bool] -- True if the path is excluded.
+        """
+        if is_dir:
+            path += "/"
+        if any(regex.search(path) for regex in self._exclude_regex):
+            return True
+        if self._exclude is None:
+            return False
+        match = self._exclude.match(path)
+        return match is not None and match.lastgroup[0] == "p"
+
+    def included(self, path: str) -> bool:
+        """
+        Checks if the relative path of a file passes the filter, that is, it matches the
+        inclusions, if any, and is not excluded.
+
+        Args:
+            path (str): Path of the file relative to the root of the search, separated by "/".
+
+        Returns:
+            [bool] -- True if the file is kept.
+        """
+        if self._include is not None or self._include_regex:
+            if not (
+                (self._include is not None and self._include.match(path))
+                or any(regex.search(path) for regex in self._include_regex)
+            ):
+                return False
+        return not self.excluded(path)
+
+
+__all__ = ["PathFilter", "read_ignore_file"]
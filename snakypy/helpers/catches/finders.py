@@ -1,14 +1,95 @@
-from os import walk
+import platform
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from os import X_OK, access, defpath, environ, fspath, pathsep, scandir, sep, stat
 from os.path import exists, isdir, join
 from shutil import which
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+from snakypy.helpers.catches.filters import PathFilter
+from snakypy.helpers.path import walk_entries
+
+
+def _filter_walk(walker: Iterator, top: str, filters: Optional[PathFilter]) -> Iterator:
+    """
+    Applies a "PathFilter" to a walk. The excluded folders are removed from "dirs"
+    before the walker descends into them, and the files that do not pass are discarded.
+    """
+    if filters is None:
+        yield from walker
+        return
+    cut = len(fspath(top))
+    for root, dirs, files in walker:
+        rel = fspath(root)[cut:].lstrip(sep).replace(sep, "/")
+        prefix = f"{rel}/" if rel else ""
+        dirs[:] = [e for e in dirs if not filters.excluded(prefix + e.name, True)]
+        files = [e for e in files if filters.included(prefix + e.name)]
+        yield root, dirs, files
+
+
+def _bucket_by_extension(entries: list, extensions: tuple, buckets: list) -> None:
+    """Append the path of each entry to the bucket of every extension it ends with."""
+    for entry in entries:
+        name = entry.name
+        if name.endswith(extensions):
+            for index, ext in enumerate(extensions):
+                if name.endswith(ext):
+                    buckets[index].append(entry.path)
+
+
+def _match_names(
+    directory: str, names: tuple, root_entries: dict, folder: bool = False
+) -> list:
+    """
+    Check which names exist at the root of the directory. The entries already listed
+    by the walk are used when available, otherwise the file system is consulted.
+    """
+    found = []
+    for name in names:
+        entry = root_entries.get(name)
+        if entry is not None and not entry.is_symlink():
+            if not folder or entry.is_dir():
+                found.append(join(directory, name))
+        elif (isdir if folder else exists)(join(directory, name)):
+            found.append(join(directory, name))
+    return found
+
+
+def _collect(
+    walker: Iterator, directory: str, extensions: tuple, filters: Optional[PathFilter]
+) -> tuple:
+    """
+    Walks the tree of "find_objects" and returns the paths found for each extension and
+    the entries at the root of the directory, by name.
+    """
+    root_entries: dict = {}
+    # One bucket per extension keeps the order of the results grouped by extension.
+    buckets: list = [[] for _ in extensions]
+    for root_, directory_, files_ in _filter_walk(walker, directory, filters):
+        if root_ is directory:
+            root_entries = {e.name: e for e in directory_ + files_}
+        _bucket_by_extension(files_, extensions, buckets)
+    return buckets, root_entries
 
 
 def find_objects(
-    directory: str, /, files: tuple = (), folders: tuple = (), by_extension: tuple = ()
+    directory: str,
+    /,
+    files: tuple = (),
+    folders: tuple = (),
+    by_extension: tuple = (),
+    *,
+    index: bool = False,
+    index_path: Optional[str] = None,
+    filters: Optional[PathFilter] = None,
 ) -> dict:
     """
     Find files, folders and files through its extensions.
 
+    The directory tree is traversed only once, whatever the number of extensions,
+    and each entry is compared against all the extensions in that same pass.
+
     >>> from snakypy import helpers
     >>> helpers.catches.find_objects(".", files=("mypi.ini",), folders=("snakypy",), by_extension=("txt",))
     {'files': [], 'folders': [], 'by_extension': []}
@@ -23,6 +104,14 @@ def find_objects(
         by_extension (tuple): You should receive a tuple and inform the extensions (without periods) of the files
                               you want to search for.
 
+        index (bool): If True, uses the persistent index of "snakypy.helpers.catches.index", so only the
+                      folders modified since the last search are read from the disk. (Default: False)
+
+        index_path (str): Path of the index file, if "index" is True. (Default: the user's cache folder)
+
+        filters (PathFilter): Inclusion and exclusion patterns applied to the files searched by extension.
+                              The excluded folders are not traversed. (Default: None)
+
     Returns:
         [dict] -- It will return a dictionary with the following structure:
                   {'files': [], 'folders': [], 'extension': []}
@@ -33,22 +122,38 @@ def find_objects(
 
     try:
 
-        if files:
-            for file in files:
-                if exists(join(directory, file)):
-                    data["files"].append(join(directory, file))
+        # Names found at the root of the directory, filled in during the walk.
+        root_entries: dict = {}
 
         if by_extension:
-            for ext in by_extension:
-                for root_, directory_, files_ in walk(directory):
-                    for file in files_:
-                        if file.endswith(ext):
-                            data["by_extension"].append(join(root_, file))
+            extensions = tuple(by_extension)
+            if index:
+                import sqlite3
 
-        if folders:
-            for folder in folders:
-                if isdir(join(directory, folder)):
-                    data["folders"].append(join(directory, folder))
+                from snakypy.helpers.catches.index import indexed_walk
+
+                try:
+                    buckets, root_entries = _collect(
+                        indexed_walk(directory, index_path=index_path),
+                        directory,
+                        extensions,
+                        filters,
+                    )
+                except sqlite3.Error:
+                    # An index that cannot be used, such as a locked or damaged file,
+                    # only costs the full walk.
+                    buckets, root_entries = _collect(
+                        walk_entries(directory), directory, extensions, filters
+                    )
+            else:
+                buckets, root_entries = _collect(
+                    walk_entries(directory), directory, extensions, filters
+                )
+            for bucket in buckets:
+                data["by_extension"].extend(bucket)
+
+        data["files"] = _match_names(directory, files, root_entries)
+        data["folders"] = _match_names(directory, folders, root_entries, folder=True)
 
         return data
 
@@ -58,6 +163,455 @@ def find_objects(
         )
 
 
+def _scan_root(
+    directory: str,
+    extensions: tuple,
+    files: tuple,
+    folders: tuple,
+    filters: Optional[PathFilter],
+) -> tuple:
+    """
+    Worker of "find_objects_parallel". Lists the first level of a root and returns the
+    paths found for each extension, the files and folders found by name, the
+    subdirectories to be scanned and the errors found, instead of raising them.
+    """
+    errors: list = []
+    buckets: list = [[] for _ in extensions]
+    subdirs: list = []
+    root_entries: dict = {}
+    walker = _filter_walk(walk_entries(directory, errors.append), directory, filters)
+    for root_, directory_, files_ in walker:
+        root_entries = {e.name: e for e in directory_ + files_}
+        if extensions:
+            _bucket_by_extension(files_, extensions, buckets)
+            subdirs = [e.path for e in directory_ if not e.is_symlink()]
+        break
+    found_files = _match_names(directory, files, root_entries)
+    found_folders = _match_names(directory, folders, root_entries, folder=True)
+    return buckets, found_files, found_folders, subdirs, errors
+
+
+def _scan_subtree(
+    directory: str, extensions: tuple, top: str, filters: Optional[PathFilter]
+) -> tuple:
+    """
+    Worker of "find_objects_parallel". Walks a subtree and returns the paths found
+    for each extension, along with the errors found, instead of raising them.
+    """
+    errors: list = []
+    buckets: list = [[] for _ in extensions]
+    walker = _filter_walk(walk_entries(directory, errors.append), top, filters)
+    for root_, directory_, files_ in walker:
+        _bucket_by_extension(files_, extensions, buckets)
+    return buckets, errors
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(0.0, deadline - monotonic())
+
+
+def find_objects_parallel(
+    *directories: str,
+    files: tuple = (),
+    folders: tuple = (),
+    by_extension: tuple = (),
+    max_workers: Optional[int] = None,
+    processes: bool = False,
+    timeout: Optional[float] = None,
+    filters: Optional[PathFilter] = None,
+    onerror: Optional[Callable[[OSError], Any]] = None,
+) -> dict:
+    """
+    Parallel version of "find_objects" for one or more root directories.
+
+    The first level of each root, and then each of its subdirectories, is read by a
+    pool of threads (or processes) with a limited number of workers. The results are
+    merged in the order of the roots and their subdirectories, regardless of which
+    worker finishes first, so for a single root the result is the same as "find_objects".
+    A directory that cannot be read, such as a "PermissionError", is skipped only in its
+    own subtree, and the rest of the search continues.
+
+    A thread cannot be interrupted, so with a timeout the threads of the subtrees not
+    finished in time keep running in the background, and the interpreter waits for them
+    before exiting. Use processes=True with a timeout on slow or hung file systems: the
+    processes still running are terminated when the time is over.
+
+    >>> from snakypy.helpers.catches import find_objects_parallel
+    >>> find_objects_parallel("/mnt/a", "/mnt/b", by_extension=("log",), max_workers=8)
+    {'files': [], 'folders': [], 'by_extension': []}
+
+    Args:
+        directories (str): Enter the paths of the root directories for the search.
+
+        files (tuple): You should receive a tuple and enter only the name of the file together with its extension.
+                       The files are searched at the root of each directory.
+
+        folders (tuple): You should receive a tuple and enter only the name of the folder.
+                         The folders are searched at the root of each directory.
+
+        by_extension (tuple): You should receive a tuple and inform the extensions (without periods) of the files
+                              you want to search for.
+
+        max_workers (int): Maximum number of directories scanned at the same time. (Default: None, the default
+                           of the executor used)
+
+        processes (bool): If True, uses a pool of processes instead of a pool of threads. (Default: False)
+
+        timeout (float): Maximum time, in seconds, of the whole search, including the first level of the
+                         roots. The roots and subtrees not finished in time are left out of the result and
+                         reported as "TimeoutError". (Default: None)
+
+        filters (PathFilter): Inclusion and exclusion patterns applied to the files searched by extension.
+                              The excluded folders are not traversed. (Default: None)
+
+        onerror (Callable): Function called with each "OSError" found during the search, after the
+                            scan. By default the errors are ignored.
+
+    Returns:
+        [dict] -- It will return a dictionary with the following structure:
+                  {'files': [], 'folders': [], 'by_extension': []}
+    """
+    data: dict = {"files": [], "folders": [], "by_extension": []}
+    extensions = tuple(by_extension)
+    errors: list = []
+    deadline = None if timeout is None else monotonic() + timeout
+    # Ordered parts of the result of each root: the buckets of the files at its first
+    # level, followed by the futures of its subtrees.
+    parts: list = [[] for _ in directories]
+    timed_out = False
+
+    if processes:
+        # Imported here, since "multiprocessing" is slow to import.
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor: Any = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        roots = {
+            executor.submit(
+                _scan_root, directory, extensions, files, folders, filters
+            ): index
+            for index, directory in enumerate(directories)
+        }
+        # The subtrees of each root are submitted as soon as its first level is read.
+        pending = set(roots)
+        while pending:
+            done, pending = wait(
+                pending, timeout=_remaining(deadline), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                index = roots[future]
+                try:
+                    root_buckets, found_files, found_folders, subdirs, root_errors = (
+                        future.result()
+                    )
+                except OSError as err:
+                    errors.append(err)
+                    continue
+                errors.extend(root_errors)
+                parts[index].append((root_buckets, found_files, found_folders))
+                for path in subdirs:
+                    subtree = executor.submit(
+                        _scan_subtree, path, extensions, directories[index], filters
+                    )
+                    parts[index].append((path, subtree))
+        for future in pending:
+            errors.append(TimeoutError(f"Scan timed out: {directories[roots[future]]}"))
+
+        futures = [part[1] for found in parts for part in found[1:]]
+        wait(futures, timeout=_remaining(deadline))
+        for found in parts:
+            if not found:
+                continue
+            root_buckets, found_files, found_folders = found[0]
+            data["files"].extend(found_files)
+            data["folders"].extend(found_folders)
+            found[0] = root_buckets
+            for index in range(1, len(found)):
+                path, future = found[index]
+                found[index] = []
+                if not future.done():
+                    errors.append(TimeoutError(f"Scan timed out: {path}"))
+                    continue
+                try:
+                    found[index], subtree_errors = future.result()
+                except OSError as err:
+                    errors.append(err)
+                    continue
+                errors.extend(subtree_errors)
+        timed_out = bool(pending) or not all(future.done() for future in futures)
+    finally:
+        processes_ = getattr(executor, "_processes", None) if timed_out else None
+        executor.shutdown(wait=timeout is None, cancel_futures=True)
+        # The processes of the scans not finished in time are stopped, since, unlike
+        # the threads, they can be.
+        for process in list((processes_ or {}).values()):
+            process.terminate()
+
+    buckets: list = [[] for _ in extensions]
+    for found in parts:
+        for part in found:
+            for bucket, paths in zip(buckets, part):
+                bucket.extend(paths)
+
+    for bucket in buckets:
+        data["by_extension"].extend(bucket)
+
+    if onerror is not None:
+        for error in errors:
+            onerror(error)
+
+    return data
+
+
+class ObjectMatch(NamedTuple):
+    """
+    Record yielded by "iter_objects" for each object found.
+
+    Attributes:
+        kind (str): Key of the "find_objects" result the object belongs to, that is,
+                    "files", "folders" or "by_extension".
+
+        path (str): Path of the object found.
+
+        extension (str): The extension that matched, if the kind is "by_extension". Otherwise None.
+    """
+
+    kind: str
+    path: str
+    extension: Optional[str] = None
+
+
+def iter_objects(
+    directory: str,
+    /,
+    files: tuple = (),
+    folders: tuple = (),
+    by_extension: tuple = (),
+    *,
+    limit: Optional[int] = None,
+    until: Optional[Callable[[ObjectMatch], bool]] = None,
+    filters: Optional[PathFilter] = None,
+) -> Iterator[ObjectMatch]:
+    """
+    Iterator version of "find_objects". The objects are yielded as soon as they are
+    found, so nothing is accumulated in memory and the walk stops as soon as the
+    caller stops consuming it, the limit is reached or the "until" condition is met.
+
+    The files and folders of the root are yielded first, followed by the files found
+    by extension in the order of the walk. A file that matches more than one extension
+    is yielded only once, with the first extension informed that matched.
+
+    >>> from snakypy.helpers.catches import iter_objects
+    >>> for match in iter_objects("/var/log", by_extension=("log",), limit=100):
+    ...     print(match.path)
+
+    Args:
+        directory (str): Enter the path of the root directory for the search
+
+        files (tuple): You should receive a tuple and enter only the name of the file together with its extension
+
+        folders (tuple): You should receive a tuple and enter only the name of the folder
+
+        by_extension (tuple): You should receive a tuple and inform the extensions (without periods) of the files
+                              you want to search for.
+
+        limit (int): Maximum number of objects to be yielded. (Default: None, no limit)
+
+        until (Callable): Function that receives each "ObjectMatch" yielded. If it returns True,
+                          the search stops after that object. (Default: None)
+
+        filters (PathFilter): Inclusion and exclusion patterns applied to the files searched by extension.
+                              The excluded folders are not traversed. (Default: None)
+
+    Returns:
+        [Iterator] -- Yields "ObjectMatch" records.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    count = 0
+
+    def matches() -> Iterator[ObjectMatch]:
+        for file in files:
+            if exists(join(directory, file)):
+                yield ObjectMatch("files", join(directory, file))
+        for folder in folders:
+            if isdir(join(directory, folder)):
+                yield ObjectMatch("folders", join(directory, folder))
+        if by_extension:
+            extensions = tuple(by_extension)
+            walker = _filter_walk(walk_entries(directory), directory, filters)
+            for root_, directory_, files_ in walker:
+                for entry in files_:
+                    name = entry.name
+                    if name.endswith(extensions):
+                        ext = next(e for e in extensions if name.endswith(e))
+                        yield ObjectMatch("by_extension", entry.path, ext)
+
+    for match in matches():
+        yield match
+        count += 1
+        if limit is not None and count >= limit:
+            return
+        if until is not None and until(match):
+            return
+
+
+def extension_histogram(
+    directory: str,
+    /,
+    by_extension: tuple = (),
+    *,
+    filters: Optional[PathFilter] = None,
+    onerror: Optional[Callable[[OSError], Any]] = None,
+) -> dict:
+    """
+    Counts the files and sums their sizes by extension, in a single walk and with a
+    single "stat" per file, taken from the entries of the walk itself.
+
+    >>> from snakypy.helpers.catches import extension_histogram
+    >>> extension_histogram("/var/log", by_extension=("log", "gz"))
+    {'log': {'count': 12, 'size': 482311}, 'gz': {'count': 30, 'size': 1203341}}
+    >>> extension_histogram("/var/log")
+    {'log': {'count': 12, 'size': 482311}, 'gz': {'count': 30, 'size': 1203341}, '': {'count': 4, 'size': 9000}}
+
+    Args:
+        directory (str): Enter the path of the root directory for the search
+
+        by_extension (tuple): Extensions (without periods) to be counted, with the same rules as
+                              "find_objects". If empty, all the files are grouped by their last
+                              extension, and the files without extension are grouped in "".
+
+        filters (PathFilter): Inclusion and exclusion patterns applied to the files.
+                              The excluded folders are not traversed. (Default: None)
+
+        onerror (Callable): Optional function called with the "OSError" raised when a directory
+                            cannot be read or a file cannot be measured. By default the error is ignored.
+
+    Returns:
+        [dict] -- A dictionary {extension: {'count': int, 'size': int}}, with the sizes in bytes.
+    """
+    extensions = tuple(by_extension)
+    data: dict = {ext: {"count": 0, "size": 0} for ext in extensions}
+
+    for root_, directory_, files_ in _filter_walk(
+        walk_entries(directory, onerror), directory, filters
+    ):
+        for entry in files_:
+            name = entry.name
+            if extensions:
+                if not name.endswith(extensions):
+                    continue
+                keys = [ext for ext in extensions if name.endswith(ext)]
+            else:
+                # Same rules as "os.path.splitext": the dots at the beginning do not count.
+                index = name.rfind(".")
+                has_ext = index > 0 and name[:index].strip(".")
+                start = index + 1
+                keys = [name[start:] if has_ext else ""]
+            try:
+                size = entry.stat().st_size
+            except OSError as err:
+                if onerror is not None:
+                    onerror(err)
+                continue
+            for key in keys:
+                bucket = data.get(key)
+                if bucket is None:
+                    bucket = data[key] = {"count": 0, "size": 0}
+                bucket["count"] += 1
+                bucket["size"] += size
+
+    return data
+
+
+# Index of the executables found in the folders of the "PATH", shared by "is_tool",
+# "tools_requirements" and "find_tools". It is rebuilt when the "PATH" or the mtime
+# of one of its folders changes.
+_tools_index: dict = {"key": None, "tools": {}}
+_tools_lock = Lock()
+
+
+def _tools() -> dict:
+    """Returns the index {name: [paths in the order of the "PATH"]}, updated if needed."""
+    path = environ.get("PATH", defpath)
+    folders = [folder for folder in dict.fromkeys(path.split(pathsep)) if folder]
+    mtimes = []
+    for folder in folders:
+        try:
+            mtimes.append(stat(folder).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    key = (path, tuple(mtimes))
+
+    with _tools_lock:
+        if _tools_index["key"] != key:
+            tools: dict = {}
+            for folder in folders:
+                try:
+                    with scandir(folder) as entries:
+                        for entry in entries:
+                            tools.setdefault(entry.name, []).append(entry.path)
+                except OSError:
+                    continue
+            _tools_index["key"], _tools_index["tools"] = key, tools
+        return _tools_index["tools"]
+
+
+def _which(tool: str, tools: dict) -> Optional[str]:
+    """Same result as "shutil.which", using the index of the "PATH"."""
+    if platform.system() == "Windows" or sep in tool:
+        return which(tool)
+    for candidate in tools.get(tool, ()):
+        if access(candidate, X_OK) and not isdir(candidate):
+            return candidate
+    return None
+
+
+def clear_tools_cache() -> None:
+    """
+    Discards the index of the tools of the "PATH", so that the next search reads the
+    folders again. The index is already updated automatically when the "PATH" or one
+    of its folders changes.
+
+    >>> from snakypy.helpers.catches import clear_tools_cache
+    >>> clear_tools_cache()
+    """
+    with _tools_lock:
+        _tools_index["key"], _tools_index["tools"] = None, {}
+
+
+def find_tools(*args: str) -> dict:
+    """
+        Searches several tools at once and tells which are installed and which are missing.
+
+        >>> from snakypy import helpers
+        >>> helpers.catches.find_tools("ls", "cat", "foo")
+        {'found': {'ls': '/usr/bin/ls', 'cat': '/usr/bin/cat'}, 'missing': ['foo']}
+
+    Args:
+        args (str): You must receive the name of the tools to be searched on the machine. You can pass
+                    as many as you want.
+
+    Returns:
+        [dict] -- It will return a dictionary with the following structure:
+                  {'found': {'tool': 'path'}, 'missing': []}
+    """
+    tools = _tools() if platform.system() != "Windows" else {}
+    data: dict = {"found": {}, "missing": []}
+    for tool in args:
+        found = _which(tool, tools)
+        if found is None:
+            data["missing"].append(tool)
+        else:
+            data["found"][tool] = found
+    return data
+
+
 def is_tool(*args: str) -> bool:
     """
         Searches if a tool is installed on the machine.
@@ -73,8 +627,9 @@ def is_tool(*args: str) -> bool:
     Returns:
         [bool] -- Returns True if all are found or False if none or none are not found.
     """
+    tools = _tools() if platform.system() != "Windows" else {}
     for tool in args:
-        if which(tool) is not None:
+        if _which(tool, tools) is not None:
             return True
     return False
 
@@ -93,12 +648,22 @@ def tools_requirements(*args) -> bool:
     Returns:
         Returns true or an exception.
     """
-    for tool in args:
-        if which(tool) is None:
-            raise FileNotFoundError(
-                f'The tool "{tool}" is not installed on the operating system.'
-            )
+    missing = find_tools(*args)["missing"]
+    if missing:
+        raise FileNotFoundError(
+            f'The tool "{missing[0]}" is not installed on the operating system.'
+        )
     return True
 
 
-__all__ = ["find_objects", "is_tool", "tools_requirements"]
+__all__ = [
+    "ObjectMatch",
+    "find_objects",
+    "find_objects_parallel",
+    "iter_objects",
+    "extension_histogram",
+    "clear_tools_cache",
+    "find_tools",
+    "is_tool",
+    "tools_requirements",
+]
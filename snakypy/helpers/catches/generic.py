@@ -1,5 +1,10 @@
 import re
+from os import altsep, sep
 from os.path import splitext
+from typing import Iterable, List, Optional
+
+# Extension from the first dot of the name, used by "extension" and "extensions".
+_DOTS_PATTERN = re.compile(r"(?<=[^/\\]\.).*$")
 
 
 def extension(filename: str, dots: bool = False) -> str:
@@ -32,7 +37,7 @@ def extension(filename: str, dots: bool = False) -> str:
         [object] -- Returns a string containing the extension or None.
     """
     if dots:
-        m = re.search(r"(?<=[^/\\]\.).*$", filename)
+        m = _DOTS_PATTERN.search(filename)
         if not m:
             raise TypeError("Invalid parameter type passed.")
         ext = m.group(0)
@@ -44,4 +49,63 @@ def extension(filename: str, dots: bool = False) -> str:
         return ext
 
 
-__all__ = ["extension"]
+def extensions(filenames: Iterable, dots: bool = False) -> List[Optional[str]]:
+    """Get the extension of many files at once.
+
+    Works like "extension", but for a whole batch of paths, such as the result of a
+    search or a NumPy array of strings. Instead of raising "TypeError", the position
+    of a file without extension (or of a value that is not a string) receives None,
+    so a single invalid name does not interrupt the batch.
+
+    >>> from snakypy.helpers.catches import extensions
+    >>> extensions(['/tmp/file.tar.gz', '/tmp/file', None])
+    ['.gz', None, None]
+    >>> extensions(['/tmp/file.tar.gz', '/tmp/file.txt'], dots=True)
+    ['tar.gz', 'txt']
+
+    Args:
+        filenames (Iterable): Receives the file names or their full paths
+
+        dots (bool): If it is True, returns the extension from the first point found, as in
+                     "extension". (Default: False)
+
+    Returns:
+        [list] -- Returns a list with the extension of each file, in the same order, or None.
+    """
+    result: List[Optional[str]] = []
+    append = result.append
+    if dots:
+        for filename in filenames:
+            if not isinstance(filename, str):
+                append(None)
+                continue
+            # First dot that does not come right after a separator, as in "_DOTS_PATTERN".
+            start = filename.find(".", 1) + 1
+            while start and filename[start - 2] in "/\\":
+                start = filename.find(".", start) + 1
+            if not start:
+                append(None)
+            elif "\n" in filename:
+                m = _DOTS_PATTERN.search(filename)
+                append(m.group(0) if m else None)
+            else:
+                append(filename[start:])
+        return result
+
+    for filename in filenames:
+        if not isinstance(filename, str):
+            append(None)
+            continue
+        # Same rules as "os.path.splitext": the dots at the beginning of the name do not count.
+        name = filename.rpartition(sep)[2]
+        if altsep:
+            name = name.rpartition(altsep)[2]
+        index = name.rfind(".")
+        if index > 0 and name[:index].strip("."):
+            append(name[index:])
+        else:
+            append(None)
+    return result
+
+
+__all__ = ["extension", "extensions"]
@@ -0,0 +1,271 @@
+import sqlite3
+from argparse import ArgumentParser
+from contextlib import closing
+from os import environ, fsdecode, fsencode, scandir, sep, stat
+from os.path import abspath, dirname, expanduser, join
+from time import time_ns
+from typing import Any, Callable, Iterator, Optional
+
+from snakypy.helpers.path import create as create_path
+
+# Listings of directories modified less than this interval (in nanoseconds) before
+# the scan are not trusted on the next walk, since a change in the same tick of the
+# file system clock would not change the mtime.
+RACY_INTERVAL = 2_000_000_000
+
+# The paths and the listings are stored as the bytes of the file system ("os.fsencode"),
+# since the names that are not valid UTF-8 cannot be stored as text.
+SCHEMA = """
+DROP TABLE IF EXISTS dirs;
+CREATE TABLE IF NOT EXISTS listings (
+    path BLOB PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    scanned_ns INTEGER NOT NULL,
+    entries BLOB NOT NULL
+);
+"""
+
+
+class IndexEntry:
+    """
+    Entry of a directory listing read from the index. It has the same interface as
+    "os.DirEntry" used by the walkers, so it can be used in place of it.
+    """
+
+    __slots__ = ("name", "path", "_kind")
+
+    def __init__(self, name: str, path: str, kind: str):
+        self.name = name
+        self.path = path
+        self._kind = kind
+
+    def is_dir(self) -> bool:
+        return self._kind in "dl"
+
+    def is_symlink(self) -> bool:
+        return self._kind in "ls"
+
+    def stat(self) -> Any:
+        return stat(self.path)
+
+    def __repr__(self) -> str:
+        return f"<IndexEntry {self.name!r}>"
+
+
+def default_index_path() -> str:
+    """
+    Returns the default location of the index, inside the user's cache folder.
+
+    >>> from snakypy.helpers.catches.index import default_index_path
+    >>> default_index_path()
+    '/home/william/.cache/snakypy/helpers/index.sqlite3'
+    """
+    cache = environ.get("XDG_CACHE_HOME") or expanduser(join("~", ".cache"))
+    return join(cache, "snakypy", "helpers", "index.sqlite3")
+
+
+def _connect(index_path: Optional[str]) -> sqlite3.Connection:
+    if index_path is None:
+        index_path = default_index_path()
+        create_path(dirname(index_path))
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _subtree(key: str) -> tuple:
+    """
+    Parameters that select a directory key and, with ">=" and "<", every path below it.
+    """
+    prefix = fsencode(key.rstrip(sep) + sep)
+    return fsencode(key), prefix, prefix[:-1] + bytes([prefix[-1] + 1])
+
+
+def _encode(dirs: list, files: list) -> bytes:
+    """Listing stored as names prefixed by their kind: "d" folder, "l" link to a folder,
+    "f" file and "s" any other link."""
+    kinds = [("l" if e.is_symlink() else "d") + e.name for e in dirs]
+    kinds += [("s" if e.is_symlink() else "f") + e.name for e in files]
+    return fsencode("\0".join(kinds))
+
+
+def indexed_walk(
+    top: str,
+    onerror: Optional[Callable[[OSError], Any]] = None,
+    index_path: Optional[str] = None,
+) -> Iterator:
+    """
+    Walk a directory tree top-down using a persistent index of the listings.
+
+    Each directory has only its mtime checked. The directories whose mtime did not
+    change since the last walk have their listing read from the index, the others
+    are read again with "scandir" and updated in the index. The result is the same
+    as the "scandir" walker used by "find_objects", including the pruning of "dirs".
+
+    >>> from snakypy.helpers.catches.index import indexed_walk
+    >>> for root, dirs, files in indexed_walk("/usr/share"):
+    ...     print(root, len(files))
+
+    Args:
+        top (str): Root directory of the walk.
+
+        onerror (Callable): Optional function called with the "OSError" raised when
+                            a directory cannot be read. By default the error is ignored.
+
+        index_path (str): Path of the index file. (Default: "default_index_path()")
+
+    Returns:
+        [Iterator] -- Tuples (root, dirs, files) where "dirs" and "files" are lists of entries.
+    """
+    top_key = abspath(top)
+    with closing(_connect(index_path)) as conn:
+        known = {
+            fsdecode(path): (mtime_ns, scanned_ns, fsdecode(entries))
+            for path, mtime_ns, scanned_ns, entries in conn.execute(
+                "SELECT path, mtime_ns, scanned_ns, entries FROM listings "
+                "WHERE path = ? OR (path >= ? AND path < ?)",
+                _subtree(top_key),
+            )
+        }
+        # The changes are written in a single short transaction after the walk, so the
+        # index is not locked for the other processes while the caller iterates.
+        gone_keys: list = []
+        rows: list = []
+        try:
+            stack = [(top, top_key)]
+            while stack:
+                root, key = stack.pop()
+                dirs: list = []
+                files: list = []
+                try:
+                    mtime_ns = stat(root).st_mtime_ns
+                    cached = known.get(key)
+                    if (
+                        cached is not None
+                        and cached[0] == mtime_ns
+                        and mtime_ns < cached[1] - RACY_INTERVAL
+                    ):
+                        for item in cached[2].split("\0") if cached[2] else ():
+                            entry = IndexEntry(item[1:], join(root, item[1:]), item[0])
+                            (dirs if item[0] in "dl" else files).append(entry)
+                    else:
+                        scanned_ns = time_ns()
+                        with scandir(root) as entries:
+                            for dir_entry in entries:
+                                try:
+                                    is_dir = dir_entry.is_dir()
+                                except OSError:
+                                    is_dir = False
+                                (dirs if is_dir else files).append(dir_entry)
+                        if cached is not None:
+                            # Forget the subtrees of the folders that no longer exist.
+                            names = {e.name for e in dirs}
+                            for item in cached[2].split("\0") if cached[2] else ():
+                                if item[0] == "d" and item[1:] not in names:
+                                    gone = join(key, item[1:])
+                                    gone_keys.append(_subtree(gone))
+                        rows.append(
+                            (fsencode(key), mtime_ns, scanned_ns, _encode(dirs, files))
+                        )
+                except OSError as err:
+                    if onerror is not None:
+                        onerror(err)
+                    continue
+
+                yield root, dirs, files
+
+                for entry in reversed(dirs):
+                    if not entry.is_symlink():
+                        stack.append((entry.path, join(key, entry.name)))
+        finally:
+            if gone_keys or rows:
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM listings "
+                        "WHERE path = ? OR (path >= ? AND path < ?)",
+                        gone_keys,
+                    )
+                    conn.executemany("REPLACE INTO listings VALUES (?, ?, ?, ?)", rows)
+
+
+def index_invalidate(
+    directory: Optional[str] = None, index_path: Optional[str] = None
+) -> None:
+    """
+    Removes a directory tree from the index, or the entire index if no directory is
+    informed. The next walk of the tree will read it again from the disk.
+
+    >>> from snakypy.helpers.catches.index import index_invalidate
+    >>> index_invalidate("/home/william/projects")
+    >>> index_invalidate()
+
+    Args:
+        directory (str): Root directory to be removed from the index. (Default: None, all)
+
+        index_path (str): Path of the index file. (Default: "default_index_path()")
+    """
+    with closing(_connect(index_path)) as conn, conn:
+        if directory is None:
+            conn.execute("DELETE FROM listings")
+        else:
+            conn.execute(
+                "DELETE FROM listings WHERE path = ? OR (path >= ? AND path < ?)",
+                _subtree(abspath(directory)),
+            )
+
+
+def index_rebuild(directory: str, index_path: Optional[str] = None) -> int:
+    """
+    Discards the index of a directory tree and builds it again from the disk.
+
+    >>> from snakypy.helpers.catches.index import index_rebuild
+    >>> index_rebuild("/home/william/projects")
+    1250
+
+    Args:
+        directory (str): Root directory to be indexed.
+
+        index_path (str): Path of the index file. (Default: "default_index_path()")
+
+    Returns:
+        [int] -- The number of directories indexed.
+    """
+    index_invalidate(directory, index_path)
+    return sum(1 for _ in indexed_walk(directory, index_path=index_path))
+
+
+def main(args: Optional[list] = None) -> None:
+    """
+    Command line to manage the index.
+
+    .. code-block:: shell
+
+        python -m snakypy.helpers.catches.index rebuild /home/william/projects
+        python -m snakypy.helpers.catches.index invalidate /home/william/projects
+        python -m snakypy.helpers.catches.index invalidate
+    """
+    parser = ArgumentParser(description="Manages the index of snakypy.helpers.catches")
+    parser.add_argument("command", choices=("rebuild", "invalidate"))
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--index", dest="index_path", help="Path of the index file.")
+    options = parser.parse_args(args)
+    if options.command == "rebuild":
+        if options.directory is None:
+            parser.error('the "rebuild" command requires a directory')
+        total = index_rebuild(options.directory, options.index_path)
+        print(f"Indexed {total} directories of {options.directory}")
+    else:
+        index_invalidate(options.directory, options.index_path)
+
+
+__all__ = [
+    "IndexEntry",
+    "default_index_path",
+    "indexed_walk",
+    "index_invalidate",
+    "index_rebuild",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,34 @@
-from .generic import backup_file, create_file, eqversion, filesize, read_file
-from .json import create_json, read_json, update_json
+from .backup import BackupResult, BackupStore, StoreEntry, backup_files
+from .cache import CacheInfo, FrozenDict, clear_read_cache, read_cache_info, thaw
+from .generic import (
+    backup_file,
+    create_file,
+    create_files,
+    eqversion,
+    filesize,
+    iter_lines,
+    map_file,
+    read_file,
+    tree_size,
+    write_atomic,
+)
+from .hashing import clear_hash_cache, file_hash, files_hash
+from .json import (
+    JsonJournal,
+    apply_patch,
+    create_json,
+    iter_json,
+    iter_json_lines,
+    json_transaction,
+    patch_json,
+    read_json,
+    update_json,
+)
+from .json_backend import (
+    JSON_BACKENDS,
+    JsonBackend,
+    get_json_backend,
+    set_json_backend,
+)
+from .tail import follow, tail
+from .toml import toml_get, toml_set
@@ -0,0 +1,398 @@
+import hashlib
+import json
+import os
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from datetime import datetime, timedelta
+from os import chmod, fstat, remove, replace, stat, utime, walk
+from os.path import abspath, basename, dirname, exists, join, realpath
+from shutil import copyfileobj
+from tempfile import mkstemp
+from typing import List, NamedTuple, Optional
+
+from snakypy.helpers.files.generic import _backup_path, write_atomic
+from snakypy.helpers.path import create as create_path
+
+# ioctl of Linux that shares the blocks of a file with another (reflink), on btrfs and xfs.
+_FICLONE = 0x40049409
+
+
+class BackupResult(NamedTuple):
+    """
+    Report of the backup of a file by "backup_files".
+
+    Attributes:
+        origin (str): Source location of the file.
+
+        destiny (str): Location of the backup file.
+
+        status (str): "copied", "skipped" (unchanged since the last backup) or "error".
+
+        method (str): How the data was copied: "reflink", "copy_file_range", "sendfile" or
+                      "copy". None if the file was not copied.
+
+        error (Exception): The error raised, if the status is "error". Otherwise None.
+    """
+
+    origin: str
+    destiny: str
+    status: str
+    method: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+def _copy_data(fsrc, fdst) -> str:
+    """
+    Copies the content of a file to another, trying first the methods that do not pass
+    the data through Python: the reflink, that does not even copy the blocks, then
+    "copy_file_range" and "sendfile". Returns the method used.
+    """
+    src, dst = fsrc.fileno(), fdst.fileno()
+    if platform.system() == "Linux":
+        try:
+            from fcntl import ioctl
+
+            ioctl(dst, _FICLONE, src)
+            return "reflink"
+        except OSError:
+            pass
+
+        size = fstat(src).st_size
+        methods = {
+            "copy_file_range": lambda done: os.copy_file_range(src, dst, size - done),
+            "sendfile": lambda done: os.sendfile(dst, src, done, size - done),
+        }
+        if not hasattr(os, "copy_file_range"):
+            del methods["copy_file_range"]
+        for method, send in methods.items():
+            copied = 0
+            try:
+                while copied < size:
+                    sent = send(copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError:
+                # Only try the next method if nothing was written yet.
+                if copied:
+                    raise
+                continue
+            if copied == size:
+                return method
+            # Some file systems copy nothing with these calls, so the next method is
+            # tried, but a copy that stops in the middle is an error.
+            if copied:
+                raise OSError(
+                    f">>> The copy stopped after {copied} of {size} bytes ({method})."
+                )
+
+    copyfileobj(fsrc, fdst, 1024 * 1024)
+    return "copy"
+
+
+def _backup(origin: str, destiny: str, skip_unchanged: bool) -> BackupResult:
+    try:
+        source = stat(origin)
+        if skip_unchanged:
+            try:
+                target = stat(destiny)
+                unchanged = (
+                    target.st_size == source.st_size
+                    and target.st_mtime_ns == source.st_mtime_ns
+                )
+                if unchanged:
+                    return BackupResult(origin, destiny, "skipped")
+            except FileNotFoundError:
+                pass
+        # Copied to a temporary file that then replaces the backup, so a failure in
+        # the middle of the copy keeps the previous backup intact.
+        real_destiny = realpath(destiny)
+        fd, temp_path = mkstemp(dir=dirname(real_destiny), suffix=".tmp")
+        try:
+            with open(origin, "rb") as fsrc, open(fd, "wb") as fdst:
+                method = _copy_data(fsrc, fdst)
+            try:
+                chmod(temp_path, stat(real_destiny).st_mode)
+            except FileNotFoundError:
+                chmod(temp_path, source.st_mode)
+            # Same mtime as the origin, so that the next backup can detect it unchanged.
+            utime(temp_path, ns=(source.st_atime_ns, source.st_mtime_ns))
+            replace(temp_path, real_destiny)
+        except BaseException:
+            with suppress(OSError):
+                remove(temp_path)
+            raise
+        return BackupResult(origin, destiny, "copied", method)
+    except OSError as err:
+        return BackupResult(origin, destiny, "error", error=err)
+
+
+def backup_files(
+    files: dict,
+    *,
+    date: bool = False,
+    extension: bool = True,
+    skip_unchanged: bool = True,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """
+    Creates backups of many files at the same time, in a pool of threads.
+
+    On Linux, the data is copied by the kernel: by reflink on file systems that support
+    it (btrfs, xfs), where the copy shares the blocks of the original, or else by
+    "copy_file_range" or "sendfile". The files whose backup already has the same size
+    and mtime are not copied again. Unlike "backup_file", the errors are not hidden:
+    they are reported for each file.
+
+    >>> from snakypy.helpers.files import backup_files
+    >>> report = backup_files({"/etc/app.conf": "/backup/app.conf", "/etc/db.conf": "/backup/db.conf"})
+    >>> report["/etc/app.conf"].status
+    'copied'
+
+    Args:
+        files (dict): Dictionary {origin: destiny}, with the same rules as "backup_file".
+
+        date (bool, optional): Adds date and time to the generated backup file names. Defaults to False.
+
+        extension (bool, optional): Adds the file extension in the name after the subtitle. Defaults to True.
+
+        skip_unchanged (bool, optional): Does not copy the files whose backup has the same size and mtime.
+                                         Defaults to True.
+
+        max_workers (int, optional): Maximum number of files copied at the same time. Defaults to the
+                                     default of "ThreadPoolExecutor".
+
+    Returns:
+        [dict] -- A dictionary {origin: BackupResult}, in the order received.
+    """
+    targets = {
+        origin: _backup_path(origin, destiny, date, extension)
+        for origin, destiny in files.items()
+    }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            origin: executor.submit(_backup, origin, destiny, skip_unchanged)
+            for origin, destiny in targets.items()
+        }
+        return {origin: future.result() for origin, future in futures.items()}
+
+
+class StoreEntry(NamedTuple):
+    """
+    Backup of a file registered in a "BackupStore".
+
+    Attributes:
+        origin (str): Absolute path of the file.
+
+        digest (str): SHA-256 of the content, which is also the name of the blob in the store.
+
+        size (int): Size of the file in bytes.
+
+        mtime_ns (int): Modification time of the file at the moment of the backup.
+
+        time (str): Date and time of the backup, in the ISO format.
+    """
+
+    origin: str
+    digest: str
+    size: int
+    mtime_ns: int
+    time: str
+
+
+class BackupStore:
+    """
+    Content-addressed backup store. Each different content is stored only once, in a
+    file named by its SHA-256, so backing up an unchanged file only adds a small entry
+    to the store's journal. The backups can be restored and pruned by age or count.
+
+    The store is a folder with the "objects" subfolder, holding the contents, and the
+    "entries.jsonl" file, holding one entry per line.
+
+    >>> from snakypy.helpers.files import BackupStore
+    >>> store = BackupStore("/var/backups/configs")
+    >>> store.backup("/etc/app.conf", "/etc/db.conf")
+    >>> store.restore("/etc/app.conf")
+    >>> store.prune(keep_last=10, keep_days=30)
+
+    Args:
+        root (str): Folder of the store. It is created if it does not exist.
+    """
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects = join(root, "objects")
+        self.journal = join(root, "entries.jsonl")
+        create_path(self.objects)
+
+    def _blob(self, digest: str) -> str:
+        return join(self.objects, digest[:2], digest[2:])
+
+    def entries(self) -> List[StoreEntry]:
+        """
+        Returns all the entries of the store, from the oldest to the newest.
+        """
+        if not exists(self.journal):
+            return []
+        with open(self.journal) as f:
+            return [StoreEntry(**json.loads(line)) for line in f if line.strip()]
+
+    def history(self, origin: str) -> List[StoreEntry]:
+        """
+        Returns the entries of a file, from the oldest to the newest.
+
+        Args:
+            origin (str): Path of the file.
+        """
+        origin = abspath(origin)
+        return [e for e in self.entries() if e.origin == origin]
+
+    def _store(self, origin: str, latest: Optional[StoreEntry]) -> StoreEntry:
+        source = stat(origin)
+        if (
+            latest is not None
+            and latest.size == source.st_size
+            and latest.mtime_ns == source.st_mtime_ns
+            and exists(self._blob(latest.digest))
+        ):
+            # Same size and mtime as the last backup: the content is already stored.
+            digest = latest.digest
+        else:
+            # Copied while hashing, in a single read of the file, so the blob always
+            # matches its name. The copy is discarded if the content is already stored.
+            sha256 = hashlib.sha256()
+            fd, temp_path = mkstemp(dir=self.objects, suffix=".tmp")
+            try:
+                with open(origin, "rb") as f, open(fd, "wb") as out:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                        sha256.update(chunk)
+                        out.write(chunk)
+                digest = sha256.hexdigest()
+                blob = self._blob(digest)
+                if exists(blob):
+                    remove(temp_path)
+                else:
+                    create_path(dirname(blob))
+                    replace(temp_path, blob)
+            except BaseException:
+                with suppress(OSError):
+                    remove(temp_path)
+                raise
+        return StoreEntry(
+            origin,
+            digest,
+            source.st_size,
+            source.st_mtime_ns,
+            datetime.today().isoformat(),
+        )
+
+    def backup(self, *paths: str) -> List[StoreEntry]:
+        """
+        Backs up one or more files. The contents already present in the store are not
+        copied again, and the unchanged files (same size and mtime as their last backup)
+        are not even read.
+
+        Args:
+            paths (str): Paths of the files.
+
+        Returns:
+            [list] -- The entries registered.
+        """
+        latest = {e.origin: e for e in self.entries()}
+        registered = []
+        for path in paths:
+            origin = abspath(path)
+            registered.append(self._store(origin, latest.get(origin)))
+        with open(self.journal, "a") as f:
+            f.write("".join(json.dumps(e._asdict()) + "\n" for e in registered))
+        return registered
+
+    def restore(
+        self,
+        origin: str,
+        destiny: Optional[str] = None,
+        *,
+        before: Optional[datetime] = None,
+    ) -> StoreEntry:
+        """
+        Restores the most recent backup of a file.
+
+        Args:
+            origin (str): Path of the file that was backed up.
+
+            destiny (str): Where to restore the file. (Default: the origin itself)
+
+            before (datetime): If informed, restores the most recent backup made before this date.
+
+        Returns:
+            [StoreEntry] -- The entry restored.
+        """
+        history = self.history(origin)
+        if before is not None:
+            history = [e for e in history if datetime.fromisoformat(e.time) < before]
+        if not history:
+            raise FileNotFoundError(f">>> There is no backup of {origin} in the store.")
+        entry = history[-1]
+        target = destiny or entry.origin
+        fd, temp_path = mkstemp(dir=dirname(abspath(target)), suffix=".tmp")
+        try:
+            with open(self._blob(entry.digest), "rb") as fsrc, open(fd, "wb") as fdst:
+                _copy_data(fsrc, fdst)
+            with suppress(FileNotFoundError):
+                chmod(temp_path, stat(target).st_mode)
+            replace(temp_path, target)
+        except BaseException:
+            with suppress(OSError):
+                remove(temp_path)
+            raise
+        return entry
+
+    def prune(
+        self, keep_last: Optional[int] = None, keep_days: Optional[float] = None
+    ) -> int:
+        """
+        Removes the old entries and the contents that are no longer used by any entry.
+        An entry is kept if it is among the last "keep_last" backups of its file or if it
+        is newer than "keep_days" days. If neither is informed, nothing is removed.
+
+        Args:
+            keep_last (int): Number of backups kept for each file.
+
+            keep_days (float): Age, in days, of the backups kept.
+
+        Returns:
+            [int] -- The number of entries removed.
+        """
+        if keep_last is None and keep_days is None:
+            return 0
+        entries = self.entries()
+        limit = datetime.today() - timedelta(days=keep_days or 0)
+        counts: dict = {}
+        kept = []
+        for entry in reversed(entries):
+            counts[entry.origin] = counts.get(entry.origin, 0) + 1
+            recent = keep_last is not None and counts[entry.origin] <= keep_last
+            young = (
+                keep_days is not None and datetime.fromisoformat(entry.time) >= limit
+            )
+            if recent or young:
+                kept.append(entry)
+        kept.reverse()
+        write_atomic(
+            "".join(json.dumps(e._asdict()) + "\n" for e in kept), self.journal
+        )
+
+        used = {e.digest for e in kept}
+        for root_, directory_, files_ in walk(self.objects):
+            for name in files_:
+                digest = basename(root_) + name
+                if digest not in used and not name.endswith(".tmp"):
+                    with suppress(FileNotFoundError):
+                        remove(join(root_, name))
+        return len(entries) - len(kept)
+
+
+__all__ = ["BackupResult", "backup_files", "BackupStore", "StoreEntry"]
@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from copy import deepcopy
+from os import stat
+from threading import Lock
+from typing import Any, Callable, NamedTuple
+
+# Contents already read, by (kind, path): (inode, mtime, size), content.
+_cache: OrderedDict = OrderedDict()
+_cache_lock = Lock()
+_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+# Maximum sum of the sizes of the files kept, in bytes.
+READ_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of the cache of "read_file" and "read_json", as returned by "read_cache_info".
+
+    Attributes:
+        hits (int): Number of reads served by the cache.
+
+        misses (int): Number of reads that had to read the file.
+
+        entries (int): Number of files kept.
+
+        bytes (int): Sum of the sizes of the files kept.
+
+        max_bytes (int): Limit of "bytes", from "READ_CACHE_SIZE".
+    """
+
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+class FrozenDict(dict):
+    """
+    Dictionary that cannot be changed, returned by "read_json" with cache=True so the
+    callers cannot corrupt the cached data. It is still a "dict", so it can be read and
+    serialized as one, and it can be copied and pickled. Use "thaw" to get a copy that
+    can be changed.
+    """
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "FrozenDict":
+        self = super().__new__(cls)
+        dict.__init__(self, *args, **kwargs)
+        return self
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Filled by "__new__", so calling "__init__" again does not change the content.
+        pass
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(
+            ">>> The content returned by the cache cannot be changed. Use thaw()."
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple:
+        return type(self), (dict(self),)
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenDict":
+        return FrozenDict((key, deepcopy(item, memo)) for key, item in self.items())
+
+
+def freeze(value: Any) -> Any:
+    """
+    Converts the dictionaries to "FrozenDict" and the lists to tuples, recursively.
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Returns a copy of a content returned by the cache that can be changed, with
+    dictionaries and lists, as returned without the cache.
+
+    >>> from snakypy.helpers.files import read_json, thaw
+    >>> config = thaw(read_json('/etc/app/config.json', cache=True))
+    >>> config["debug"] = True
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def cached_read(kind: str, file_path: str, load: Callable[[str], Any]) -> Any:
+    """
+    Returns the content of a file loaded by "load", reading it again only if its inode,
+    mtime or size changed since the last read. An unchanged file costs a single "stat".
+    """
+    info = stat(file_path)
+    version = (info.st_ino, info.st_mtime_ns, info.st_size)
+    key = (kind, file_path)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return cached[1]
+        _stats["misses"] += 1
+
+    content = load(file_path)
+    size = info.st_size
+    with _cache_lock:
+        previous = _cache.pop(key, None)
+        if previous is not None:
+            _stats["bytes"] -= previous[0][2]
+        if size <= READ_CACHE_SIZE:
+            _cache[key] = (version, content)
+            _stats["bytes"] += size
+            while _stats["bytes"] > READ_CACHE_SIZE:
+                _, (old_version, _) = _cache.popitem(last=False)
+                _stats["bytes"] -= old_version[2]
+    return content
+
+
+def read_cache_info() -> CacheInfo:
+    """
+    Returns the statistics of the cache used by "read_file" and "read_json" with cache=True.
+
+    >>> from snakypy.helpers.files import read_cache_info
+    >>> read_cache_info()
+    CacheInfo(hits=5820, misses=3, entries=3, bytes=10240, max_bytes=67108864)
+    """
+    with _cache_lock:
+        return CacheInfo(
+            _stats["hits"],
+            _stats["misses"],
+            len(_cache),
+            _stats["bytes"],
+            READ_CACHE_SIZE,
+        )
+
+
+def clear_read_cache() -> None:
+    """
+    Discards the contents kept by "read_file" and "read_json" with cache=True and resets
+    the statistics.
+
+    >>> from snakypy.helpers.files import clear_read_cache
+    >>> clear_read_cache()
+    """
+    with _cache_lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0, bytes=0)
+
+
+__all__ = [
+    "CacheInfo",
+    "FrozenDict",
+    "thaw",
+    "read_cache_info",
+    "clear_read_cache",
+]
@@ -1,13 +1,104 @@
-from contextlib import suppress
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime
-from os.path import exists, getsize
+from mmap import ACCESS_READ, mmap
+from os import O_CREAT, O_EXCL, O_RDONLY, O_WRONLY, PathLike, chmod, close, fstat, fsync
+from os import open as os_open
+from os import remove, replace, stat, urandom
+from os.path import dirname, exists, getsize, join, realpath, split
 from shutil import SameFileError, copyfile
-from typing import Any, List, Union
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 
-from tomlkit import dumps, parse
+from snakypy.helpers.files.cache import cached_read
+from snakypy.helpers.files.toml import toml_get, toml_set
+from snakypy.helpers.path import walk_entries
 
 
-def create_file(content: Any, file_path: str, force: bool = False) -> bool:
+def _write_temp(
+    content: Any, file_path: str, sync: bool = False, encoding: Optional[str] = None
+) -> str:
+    """
+    Writes the content in a temporary file next to "file_path" and returns its path.
+    The temporary file receives the permissions of "file_path", if it exists.
+    """
+    head, tail = split(file_path)
+    temp_path = join(head, f".{tail}.{urandom(4).hex()}.tmp")
+    fd = os_open(temp_path, O_WRONLY | O_CREAT | O_EXCL, 0o666)
+    try:
+        with open(fd, "w", encoding=encoding) as f:
+            f.write(content)
+            if sync:
+                f.flush()
+                fsync(f.fileno())
+        with suppress(FileNotFoundError):
+            chmod(temp_path, stat(file_path).st_mode)
+    except BaseException:
+        with suppress(OSError):
+            remove(temp_path)
+        raise
+    return temp_path
+
+
+def _fsync_dir(directory: str) -> None:
+    """Makes the renames inside a directory durable. Not supported on Windows."""
+    if platform.system() == "Windows":
+        return
+    fd = os_open(directory or ".", O_RDONLY)
+    try:
+        fsync(fd)
+    finally:
+        close(fd)
+
+
+def write_atomic(
+    content: Any,
+    file_path: str,
+    *,
+    sync: bool = False,
+    encoding: Optional[str] = None,
+) -> None:
+    """
+    Writes a text file atomically: the content is written in a temporary file in the
+    same directory, which then replaces the file. A reader never sees the file half
+    written, and a failure in the middle of the writing keeps the previous file intact.
+    If "file_path" is a symbolic link, the file it points to is replaced, and the link
+    is kept.
+
+    >>> from snakypy.helpers.files import write_atomic
+    >>> write_atomic('{"key": "value"}', '/tmp/config.json', sync=True)
+
+    Args:
+        content (str): Reports a text or an object containing a text.
+
+        file_path (str): You must receive the full absolute file path.
+
+        sync (bool): If True, the data and the rename are flushed to the disk with "fsync"
+                     before returning, so they survive a crash of the machine. (default: False)
+
+        encoding (str): Encoding of the text. (default: the encoding of the system, as "open")
+    """
+    file_path = realpath(file_path)
+    temp_path = _write_temp(content, file_path, sync, encoding)
+    try:
+        replace(temp_path, file_path)
+    except BaseException:
+        with suppress(OSError):
+            remove(temp_path)
+        raise
+    if sync:
+        _fsync_dir(dirname(file_path))
+
+
+def create_file(
+    content: Any,
+    file_path: str,
+    force: bool = False,
+    *,
+    atomic: bool = False,
+    sync: bool = False,
+) -> bool:
     """
     Create a text file.
 
@@ -29,6 +120,11 @@ def create_file(content: Any, file_path: str, force: bool = False) -> bool:
     Keyword Arguments:
         **force {bool}** -- Use the True option if you want to overwrite the existing file. (default: {False})
 
+        **atomic {bool}** -- Writes the file with "write_atomic", so that it is never left half written.
+        (default: {False})
+
+        **sync {bool}** -- With atomic=True, also flushes the file to the disk with "fsync". (default: {False})
+
     Returns:
         **[bool]** -- If everything went well, it will return True.
     """
@@ -39,6 +135,9 @@ def create_file(content: Any, file_path: str, force: bool = False) -> bool:
         )
     else:
         try:
+            if atomic:
+                write_atomic(content, file_path, sync=sync)
+                return True
             with open(file_path, "w") as f:
                 f.write(content)
                 return True
@@ -46,7 +145,65 @@ def create_file(content: Any, file_path: str, force: bool = False) -> bool:
             raise Exception(f">>> There was an error creating the file: {err}")
 
 
-def read_file(file_path: str, split: bool = False) -> Union[str, List[str]]:
+def create_files(contents: dict, force: bool = False, *, sync: bool = False) -> bool:
+    """
+    Create several text files atomically, as a batch.
+
+    All the files are first written in temporary files. Only if every one of them was
+    written are they moved to their places, so a failure does not replace any file.
+    With sync=True, each file is flushed with "fsync" and each directory involved
+    is flushed only once, at the end, instead of once per file.
+
+    >>> from snakypy.helpers.files import create_files
+    >>> create_files({'/tmp/a.txt': 'A', '/tmp/b.txt': 'B'}, force=True, sync=True)
+    True
+
+    Args:
+        contents (dict): Dictionary {file path: content}.
+
+        force (bool): Use the True option if you want to overwrite the existing files. (default: False)
+
+        sync (bool): If True, the files and the renames are flushed to the disk. (default: False)
+
+    Returns:
+        [bool] -- If everything went well, it will return True.
+    """
+    if not force:
+        for file_path in contents:
+            if exists(file_path):
+                raise FileExistsError(
+                    f">>> The file {file_path} already exists, use force=True."
+                )
+
+    temps: list = []
+    renamed = 0
+    try:
+        for file_path, content in contents.items():
+            file_path = realpath(file_path)
+            temps.append((_write_temp(content, file_path, sync), file_path))
+        for temp_path, file_path in temps:
+            replace(temp_path, file_path)
+            renamed += 1
+    except Exception as err:
+        for temp_path, file_path in temps[renamed:]:
+            with suppress(OSError):
+                remove(temp_path)
+        raise Exception(f">>> There was an error creating the files: {err}")
+
+    if sync:
+        for directory in dict.fromkeys(dirname(p) for _, p in temps):
+            _fsync_dir(directory)
+    return True
+
+
+def _read_text(file_path: str) -> str:
+    with open(file_path) as f:
+        return f.read()
+
+
+def read_file(
+    file_path: str, split: bool = False, *, cache: bool = False
+) -> Union[str, List[str]]:
     """
     Reads a text file.
 
@@ -63,17 +220,104 @@ def read_file(file_path: str, split: bool = False) -> Union[str, List[str]]:
         split (bool): If this option is True, a list will be returned where
                                 the breaks will be made using line skips. (default: {False})
 
+        cache (bool): Keeps the content in memory and reads the file again only if its inode,
+                      mtime or size changed. See "read_cache_info". (default: {False})
+
     Returns:
         [str|list]: By default it returns a string. If the option split=True,
                     a list of line breaks will be returned.
     """
     try:
-        with open(file_path) as f:
-            if split:
-                return f.read().split("\n")
-            return f.read()
+        if cache:
+            content = cached_read("text", file_path, _read_text)
+        else:
+            content = _read_text(file_path)
     except FileNotFoundError as err:
         raise FileNotFoundError(f'>>> File "{file_path}" does not exist. {err}')
+    if split:
+        return content.split("\n")
+    return content
+
+
+def iter_lines(file_path: str, binary: bool = False) -> Iterator[Union[str, bytes]]:
+    """
+    Reads a text file line by line, without loading it whole in memory.
+
+    The lines are the same as the list returned by "read_file" with split=True, that
+    is, without the line break, and with an empty line at the end if the file ends
+    with a line break. The memory used does not depend on the size of the file.
+
+    >>> from snakypy.helpers.files import iter_lines
+    >>> for line in iter_lines('/var/log/syslog'):
+    ...     if 'error' in line:
+    ...         print(line)
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        binary (bool): If True, the lines are returned as bytes, without decoding and
+                       without translating the line breaks. (default: {False})
+
+    Returns:
+        [Iterator] -- Yields the lines of the file.
+    """
+    newline: Any = b"\n" if binary else "\n"
+    try:
+        with open(file_path, "rb" if binary else "r") as f:
+            line = newline
+            for line in f:
+                yield line[:-1] if line.endswith(newline) else line
+            if line.endswith(newline):
+                yield newline[:0]
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f'>>> File "{file_path}" does not exist. {err}')
+
+
+@contextmanager
+def map_file(file_path: str) -> Iterator[Union[mmap, bytes]]:
+    """
+    Maps a file in memory, read-only, for the duration of the "with" block.
+
+    The pages of the file are loaded by the operating system only when accessed, so
+    very large files can be searched without reading them. The object works like
+    bytes: it accepts "find", "readline", slices and regular expressions of bytes,
+    and "memoryview" gives slices without any copy. The memoryviews must be
+    released before the end of the block. An empty file is returned as b"".
+
+    >>> import re
+    >>> from snakypy.helpers.files import map_file
+    >>> with map_file('/var/log/syslog') as data:
+    ...     errors = len(re.findall(rb'error', data))
+    ...     header = memoryview(data)[:100]
+    ...     header.release()
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+    Returns:
+        [mmap] -- The memory map of the file.
+    """
+    try:
+        f = open(file_path, "rb")
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f'>>> File "{file_path}" does not exist. {err}')
+    with f:
+        if fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _backup_path(origin: str, destiny: str, date: bool, extension: bool) -> str:
+    """Name of the backup file, with the rules of "backup_file"."""
+    ext = ""
+    if extension:
+        ext = f".{origin.split('.')[-1]}"
+    destiny_format = destiny
+    if date or origin == destiny and not date:
+        destiny_format = f"{destiny}__BACKUP-{datetime.today().isoformat()}{ext}"
+    return destiny_format
 
 
 def backup_file(
@@ -100,12 +344,7 @@ def backup_file(
         extension (bool, optional): Adds the file extension in the name after the subtitle. Defaults to True.
     """
 
-    ext = ""
-    if extension:
-        ext = f".{origin.split('.')[-1]}"
-    destiny_format = destiny
-    if date or origin == destiny and not date:
-        destiny_format = f"{destiny}__BACKUP-{datetime.today().isoformat()}{ext}"
+    destiny_format = _backup_path(origin, destiny, date, extension)
     with suppress(FileNotFoundError, SameFileError):
         copyfile(origin, destiny_format)
 
@@ -124,47 +363,41 @@ def eqversion(filepath, version, *, key=("tool", "poetry", "version")):
 
         NOTE: In ".." it defines as much of the directory that wants to return.
 
+    The version is checked with "toml_get", using the cache, so an unchanged file costs
+    a single "stat". The file is only parsed by "tomlkit" and rewritten if the version
+    is different.
+
     Args:
         filepath: File path "pyproject.toml".
         version: Enter the version found in the "__init__.py" file of the package.
-        key: You must pass the key level to access the version on "pyproject.toml".
-        By default, this value is used for Poetry.
+        key: You must pass the key level to access the version on "pyproject.toml", at any
+        depth. By default, this value is used for Poetry.
     """
+    if not len(key):
+        raise KeyError(
+            f'Error function "{eqversion.__name__}": Enter the access keys. '
+            f'Must be a tuple. E.g: key=("key1", "key2",...)'
+        )
     with suppress(FileNotFoundError):
-        parsed = parse(read_file(filepath))
-        change = False
+        if toml_get(filepath, key, cache=True) != version:
+            toml_set(filepath, key, version)
+
+
+_UNITS = {"kb": 1024, "mb": 1024 * 1024, "gb": 1024 * 1024 * 1024}
 
-        if not len(key):
-            raise KeyError(
-                f'Error function "{eqversion.__name__}": Enter the access keys. '
-                f'Must be a tuple. E.g: key=("key1", "key2",...)'
-            )
-        elif len(key) == 1:
-            if parsed[key[0]] != version:
-                parsed[key[0]] = version
-                change = True
-        elif len(key) == 2:
-            if parsed[key[0]][key[1]] != version:
-                parsed[key[0]][key[1]] = version
-                change = True
-        elif len(key) == 3:
-            if parsed[key[0]][key[1]][key[2]] != version:
-                parsed[key[0]][key[1]][key[2]] = version
-                change = True
-        elif len(key) == 4:
-            if parsed[key[0]][key[1]][key[2]][key[3]] != version:
-                parsed[key[0]][key[1]][key[2]][key[3]] = version
-                change = True
-        else:
-            raise KeyError(
-                f'Error function "{eqversion.__name__}": The number of supported keys has overflowed. Must be < 4.'
-            )
 
-        if change:
-            create_file(dumps(parsed), filepath, force=True)
+def _converter(unit: str) -> Callable[[int], float]:
+    """Returns the function that converts a size in bytes to the unit informed."""
+    divisor = _UNITS.get(unit.lower())
+    if divisor is None:
+        return lambda size: size
+    return lambda size: round(size / divisor, 3)
 
 
-def filesize(file: str, unit: str = "") -> float:
+def filesize(
+    file: Union[str, bytes, PathLike, Iterable[Union[str, bytes, PathLike]]],
+    unit: str = "",
+) -> Union[float, List[float]]:
     """
         Function to return the size of a file in bytes, kilobyte, megabytes and gigabytes
 
@@ -175,25 +408,152 @@ def filesize(file: str, unit: str = "") -> float:
             filesize("file.sh", unit="kb")
             filesize("file.tar.gz", unit="mb")
             filesize("file.iso", unit="gb")
+            filesize(["file.txt", "file.sh"], unit="kb")
 
 
     Args:
-        file (str): Inform the file with its path.
+        file (str): Inform the file with its path, or a list of paths to get the size of
+        each one.
         unit (str): If None, it returns the size in bytes, otherwise it will have the options: kb = Kilobyte,
         mb = megabytes, gb = gigabytes
 
     Returns:
-        float
-    """
-    size = getsize(file)
-    if unit.lower() == "kb":
-        return round(size / 1024, 3)
-    elif unit.lower() == "mb":
-        return round(size / (1024 * 1024), 3)
-    elif unit.lower() == "gb":
-        return round(size / (1024 * 1024 * 1024), 3)
-    else:
-        return size
+        float -- Or a list with the size of each file, in the order received.
+    """
+    convert = _converter(unit)
+    if isinstance(file, (str, bytes, PathLike)):
+        return convert(getsize(file))
+    return [convert(stat(path).st_size) for path in file]
+
+
+def _tree_sizes(
+    top: str,
+    seen: set,
+    lock: Lock,
+    onerror: Optional[Callable[[OSError], Any]],
+    descend: bool = True,
+) -> Tuple[dict, dict, int]:
+    """
+    Sums the sizes of the files of each folder of a tree, without its subfolders.
+    Returns the sums by folder, in the order of the walk, the parent of each folder
+    and the number of files counted. The inodes with more than one hardlink are
+    registered in "seen", so they are counted only once.
+    """
+    own: dict = {}
+    parents: dict = {}
+    count = 0
+    for root, dirs, files in walk_entries(top, onerror):
+        size = 0
+        # The links to folders are counted as files, since they are not followed.
+        for entry in files + [e for e in dirs if e.is_symlink()]:
+            try:
+                info = entry.stat(follow_symlinks=False)
+            except OSError as err:
+                if onerror is not None:
+                    onerror(err)
+                continue
+            if info.st_nlink > 1:
+                key = (info.st_dev, info.st_ino)
+                with lock:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+            size += info.st_size
+            count += 1
+        own[root] = size
+        for entry in dirs:
+            if not entry.is_symlink():
+                parents[entry.path] = root
+        if not descend:
+            dirs[:] = []
+    return own, parents, count
+
+
+def tree_size(
+    directory: str,
+    unit: str = "",
+    *,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    onerror: Optional[Callable[[OSError], Any]] = None,
+) -> dict:
+    """
+    Calculates the total size of the files of a directory tree, like the "du" command,
+    and the size of each folder, including its subfolders.
+
+    The tree is read with a single "scandir" per folder. The files with more than one
+    hardlink are counted only once and the symbolic links are not followed. The sizes
+    are the apparent sizes of the files, not the blocks used on the disk.
 
+    >>> from snakypy.helpers.files import tree_size
+    >>> tree_size("/home/william/projects", unit="mb")
+    {'size': 120.52, 'files': 3017, 'directories': {'/home/william/projects': 120.52, ...}}
+    >>> tree_size("/usr", parallel=True)["size"]
+    9513467269
 
-__all__ = ["read_file", "create_file", "backup_file", "eqversion", "filesize"]
+    Args:
+        directory (str): Root directory of the tree.
+
+        unit (str): Unit of the sizes, as in "filesize": "kb", "mb" or "gb". (Default: bytes)
+
+        parallel (bool): If True, the subfolders of the root are read at the same time, in a
+                         pool of threads. (Default: False)
+
+        max_workers (int): Maximum number of subfolders read at the same time, if "parallel" is
+                           True. (Default: the default of "ThreadPoolExecutor")
+
+        onerror (Callable): Optional function called with the "OSError" raised when a folder or
+                            file cannot be read. By default the error is ignored.
+
+    Returns:
+        [dict] -- A dictionary with the total "size", the number of "files" and the size of
+                  each folder in "directories", from the root to the deepest ones.
+    """
+    try:
+        stat(directory)
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f'>>> Directory "{directory}" does not exist. {err}')
+
+    seen: set = set()
+    lock = Lock()
+    if parallel:
+        own, parents, count = _tree_sizes(directory, seen, lock, onerror, False)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            subtrees = executor.map(
+                lambda top: _tree_sizes(top, seen, lock, onerror), list(parents)
+            )
+            for sub_own, sub_parents, sub_count in subtrees:
+                own.update(sub_own)
+                parents.update(sub_parents)
+                count += sub_count
+    else:
+        own, parents, count = _tree_sizes(directory, seen, lock, onerror)
+
+    # The walk lists each folder before its subfolders, so in reverse order every
+    # folder is complete when it is added to its parent.
+    totals = dict(own)
+    for path in reversed(list(own)):
+        parent = parents.get(path)
+        if parent in totals:
+            totals[parent] += totals[path]
+
+    convert = _converter(unit)
+    return {
+        "size": convert(sum(own.values())),
+        "files": count,
+        "directories": {path: convert(totals[path]) for path in own},
+    }
+
+
+__all__ = [
+    "read_file",
+    "iter_lines",
+    "map_file",
+    "create_file",
+    "create_files",
+    "write_atomic",
+    "backup_file",
+    "eqversion",
+    "filesize",
+    "tree_size",
+]
@@ -0,0 +1,160 @@
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from os import fstat
+from threading import Lock, local
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Digests already calculated, by (device, inode, size, mtime, algorithm).
+_cache: OrderedDict = OrderedDict()
+_cache_lock = Lock()
+CACHE_SIZE = 100_000
+
+# Reading buffer of each thread, reused between the files.
+_buffers = local()
+
+
+def _hasher(algorithm: str) -> Any:
+    if algorithm.startswith("xxh"):
+        if xxhash is None:
+            raise ImportError(
+                f'The algorithm "{algorithm}" requires the "xxhash" package. '
+                "Install it with: pip install xxhash"
+            )
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def clear_hash_cache() -> None:
+    """
+    Discards the digests kept by "file_hash" and "files_hash" with cache=True.
+
+    >>> from snakypy.helpers.files import clear_hash_cache
+    >>> clear_hash_cache()
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def file_hash(
+    file_path: str,
+    algorithm: str = "sha256",
+    *,
+    buffer_size: int = 1024 * 1024,
+    cache: bool = False,
+) -> str:
+    """
+    Calculates the hash of a file, reading it in chunks, so the memory used does not
+    depend on the size of the file. The reading buffer is reused between the calls.
+
+    >>> from snakypy.helpers.files import file_hash
+    >>> file_hash('/tmp/file.txt')
+    'b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9'
+    >>> file_hash('/tmp/file.txt', 'blake2b', cache=True)
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        algorithm (str): Any algorithm of "hashlib", such as "sha256", "blake2b" and "md5", or
+                         "xxh64", "xxh3_64" and "xxh128" if the "xxhash" package is installed.
+                         (default: {"sha256"})
+
+        buffer_size (int): Size of the chunks read. (default: {1048576})
+
+        cache (bool): If True, a file with the same device, inode, size and mtime of a file
+                      already calculated is not read again. (default: {False})
+
+    Returns:
+        [str] -- The hexadecimal digest.
+    """
+    hasher = _hasher(algorithm)
+    try:
+        with open(file_path, "rb") as f:
+            key = None
+            if cache:
+                info = fstat(f.fileno())
+                key = (
+                    info.st_dev,
+                    info.st_ino,
+                    info.st_size,
+                    info.st_mtime_ns,
+                    algorithm,
+                )
+                with _cache_lock:
+                    digest = _cache.get(key)
+                    if digest is not None:
+                        _cache.move_to_end(key)
+                        return digest
+
+            buffer = getattr(_buffers, "buffer", None)
+            if buffer is None or len(buffer) != buffer_size:
+                buffer = _buffers.buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            readinto = f.readinto
+            update = hasher.update
+            size = readinto(buffer)
+            while size:
+                update(view[:size])
+                size = readinto(buffer)
+            view.release()
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f'>>> File "{file_path}" does not exist. {err}')
+
+    digest = hasher.hexdigest()
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = digest
+            if len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return digest
+
+
+def files_hash(
+    files: Iterable[str],
+    algorithm: str = "sha256",
+    *,
+    cache: bool = False,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Calculates the hash of many files at the same time, in a pool of threads.
+    The hash functions release the GIL while processing, so the files are hashed in
+    parallel.
+
+    >>> from snakypy.helpers.files import files_hash
+    >>> files_hash(['/tmp/a.txt', '/tmp/b.txt', '/tmp/missing.txt'])
+    {'/tmp/a.txt': 'a591a6d4...', '/tmp/b.txt': '3a4b19f1...', '/tmp/missing.txt': None}
+
+    Args:
+        files (Iterable): Paths of the files.
+
+        algorithm (str): Algorithm used, as in "file_hash". (default: {"sha256"})
+
+        cache (bool): Uses the cache of "file_hash". (default: {False})
+
+        max_workers (int): Maximum number of files hashed at the same time. (default: the default
+                           of "ThreadPoolExecutor")
+
+    Returns:
+        [dict] -- A dictionary {path: digest}, in the order received. The files that could not
+                  be read receive None.
+    """
+    _hasher(algorithm)
+
+    def task(file_path: str) -> Optional[str]:
+        try:
+            return file_hash(file_path, algorithm, cache=cache)
+        except OSError:
+            return None
+
+    paths = list(files)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(task, paths)))
+
+
+__all__ = ["file_hash", "files_hash", "clear_hash_cache"]
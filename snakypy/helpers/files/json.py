@@ -1,29 +1,62 @@
 import json
+import re
+from contextlib import contextmanager
+from copy import deepcopy
+from os import O_CREAT, O_RDWR, close, fsync
+from os import open as os_open
+from os import stat
 from os.path import exists, splitext
+from time import monotonic, sleep
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Type
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
 
-def read_json(file_path: str) -> dict:
+from snakypy.helpers.files.cache import cached_read, freeze
+from snakypy.helpers.files.generic import write_atomic
+from snakypy.helpers.files.json_backend import get_json_backend
+
+
+def _load_json(file_path: str) -> Any:
+    with open(file_path, "rb") as f:
+        return get_json_backend().loads(f.read())
+
+
+def _load_frozen(file_path: str) -> Any:
+    return freeze(_load_json(file_path))
+
+
+def read_json(file_path: str, *, cache: bool = False) -> dict:
     """
     Function that reads JSON configuration file and returns data.
 
     >>> from snakypy import helpers
     >>> file = '/tmp/file.json'
     >>> helpers.files.read_json(file)
+    >>> helpers.files.read_json(file, cache=True)
 
     Args:
         file_path (str): You must receive the full/absolute file path
 
+        cache (bool): Keeps the content in memory and reads the file again only if its inode,
+                      mtime or size changed. The content returned cannot be changed: the
+                      dictionaries are "FrozenDict" and the lists are tuples. Use "thaw" to get
+                      a copy that can be changed. See "read_cache_info". (default: {False})
+
     Returns:
         [dict]: If the file is found it will return a dictionary
     """
 
+    backend = get_json_backend()
     try:
-        with open(file_path) as f:
-            data = json.load(f)
-        return data
+        if cache:
+            return cached_read("json", file_path, _load_frozen)
+        return _load_json(file_path)
     except FileNotFoundError as err:
         raise FileNotFoundError(f">>> File not found {err}")
-    except json.decoder.JSONDecodeError:
+    except backend.errors:
         raise Exception(f">>> Incorrect Json file structure: {file_path}")
     except PermissionError:
         raise PermissionError(
@@ -33,7 +66,15 @@ def read_json(file_path: str) -> dict:
         raise Exception(f">>> There was an error reading the file: {file_path}")
 
 
-def create_json(dictionary: dict, file_path: str, force: bool = False) -> bool:
+def create_json(
+    dictionary: dict,
+    file_path: str,
+    force: bool = False,
+    *,
+    atomic: bool = False,
+    sync: bool = False,
+    compact: bool = False,
+) -> bool:
     """
     Create a JSON file through a dictionary.
 
@@ -49,6 +90,12 @@ def create_json(dictionary: dict, file_path: str, force: bool = False) -> bool:
 
         force (bool): Use the True option if you want to overwrite the existing file. (default: {False})
 
+        atomic (bool): Writes the file with "write_atomic", so a reader never gets a partial JSON. (default: {False})
+
+        sync (bool): With atomic=True, also flushes the file to the disk with "fsync". (default: {False})
+
+        compact (bool): Writes the JSON without indentation and spaces. (default: {False})
+
     Returns:
         [bool]: If everything went well, it will return True.
     """
@@ -62,8 +109,12 @@ def create_json(dictionary: dict, file_path: str, force: bool = False) -> bool:
     else:
         try:
             if type(dictionary) is dict:
-                with open(file_path, "w") as f:
-                    json.dump(dictionary, f, indent=4, separators=(",", ": "))
+                content = get_json_backend().dumps(dictionary, None if compact else 4)
+                if atomic:
+                    write_atomic(content, file_path, sync=sync, encoding="utf-8")
+                    return True
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(content)
                     return True
             return False
         except PermissionError:
@@ -74,7 +125,14 @@ def create_json(dictionary: dict, file_path: str, force: bool = False) -> bool:
             raise Exception(f">>> There was an error creating the file. {err}")
 
 
-def update_json(file_path: str, content: dict) -> bool:
+def update_json(
+    file_path: str,
+    content: dict,
+    *,
+    atomic: bool = False,
+    sync: bool = False,
+    compact: bool = False,
+) -> bool:
     """
     Function to update json file. The "snakypy.json.read" function depends on
     reading a json file.
@@ -90,13 +148,23 @@ def update_json(file_path: str, content: dict) -> bool:
 
         content (dict): You should receive a dictionary with the updated data already.
 
+        atomic (bool): Writes the file with "write_atomic", so a reader never gets a partial JSON. (default: {False})
+
+        sync (bool): With atomic=True, also flushes the file to the disk with "fsync". (default: {False})
+
+        compact (bool): Writes the JSON without indentation and spaces. (default: {False})
+
     Returns:
         [bool]: If everything went well, it will return True.
     """
     try:
         if type(content) is dict:
-            with open(file_path, "w") as f:
-                json.dump(content, f, indent=2, separators=(",", ": "))
+            data = get_json_backend().dumps(content, None if compact else 2)
+            if atomic:
+                write_atomic(data, file_path, sync=sync, encoding="utf-8")
+                return True
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(data)
             return True
         return False
     except PermissionError:
@@ -108,4 +176,565 @@ def update_json(file_path: str, content: dict) -> bool:
         raise Exception(msg, err)
 
 
-__all__ = ["read_json", "create_json", "update_json"]
+def _pointer(path: str) -> List[str]:
+    """Splits a JSON Pointer (RFC 6901) in its unescaped tokens."""
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f'>>> Invalid JSON Pointer: "{path}"')
+    return [t.replace("~1", "/").replace("~0", "~") for t in path.split("/")[1:]]
+
+
+def _index(container: list, token: str, path: str, insert: bool = False) -> int:
+    size = len(container) + 1 if insert else len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise ValueError(f'>>> Invalid array index in "{path}"')
+    if int(token) >= size:
+        raise ValueError(f'>>> Array index out of range in "{path}"')
+    return int(token)
+
+
+def _resolve(document: Any, path: str) -> tuple:
+    """Returns the container of the location pointed and the last token."""
+    tokens = _pointer(path)
+    if not tokens:
+        return None, ""
+    container = document
+    for token in tokens[:-1]:
+        try:
+            if isinstance(container, list):
+                container = container[_index(container, token, path)]
+            else:
+                container = container[token]
+        except (KeyError, TypeError):
+            raise ValueError(f'>>> Path "{path}" does not exist.')
+    if not isinstance(container, (dict, list)):
+        raise ValueError(f'>>> Path "{path}" does not exist.')
+    return container, tokens[-1]
+
+
+def _get(document: Any, path: str) -> Any:
+    container, token = _resolve(document, path)
+    if container is None:
+        return document
+    if isinstance(container, list):
+        return container[_index(container, token, path)]
+    if token not in container:
+        raise ValueError(f'>>> Path "{path}" does not exist.')
+    return container[token]
+
+
+def _add(document: Any, path: str, value: Any) -> Any:
+    container, token = _resolve(document, path)
+    if container is None:
+        return value
+    if isinstance(container, list):
+        if token == "-":
+            container.append(value)
+        else:
+            container.insert(_index(container, token, path, insert=True), value)
+    else:
+        container[token] = value
+    return document
+
+
+def _remove(document: Any, path: str) -> Any:
+    value = _get(document, path)
+    container, token = _resolve(document, path)
+    if container is None:
+        raise ValueError(">>> The root of the document cannot be removed.")
+    if isinstance(container, list):
+        del container[int(token)]
+    else:
+        del container[token]
+    return value
+
+
+def apply_patch(document: Any, operations: List[dict]) -> Any:
+    """
+    Applies a list of changes in the JSON Patch format (RFC 6902) to a document. The
+    locations are JSON Pointers (RFC 6901), such as "/users/0/name". The operations
+    supported are "add", "remove", "replace", "move", "copy" and "test".
+
+    The document is changed in place. If an operation fails, the previous ones may
+    have already been applied.
+
+    >>> from snakypy.helpers.files.json import apply_patch
+    >>> apply_patch({"a": 1}, [{"op": "replace", "path": "/a", "value": 2}])
+    {'a': 2}
+
+    Args:
+        document (Any): The document, as returned by "read_json".
+
+        operations (list): Operations, in the order they must be applied.
+
+    Returns:
+        [Any] -- The document changed. It is a new object only if the root was replaced.
+    """
+    for operation in operations:
+        op, path = operation.get("op"), operation.get("path")
+        if path is None:
+            raise ValueError(f">>> Operation without a path: {operation}")
+        if op == "add":
+            document = _add(document, path, operation["value"])
+        elif op == "remove":
+            _remove(document, path)
+        elif op == "replace":
+            _get(document, path)
+            if path == "":
+                document = operation["value"]
+            else:
+                _remove(document, path)
+                document = _add(document, path, operation["value"])
+        elif op == "move":
+            origin = operation["from"]
+            if path.startswith(origin + "/"):
+                raise ValueError(f'>>> "{origin}" cannot be moved into itself.')
+            document = _add(document, path, _remove(document, origin))
+        elif op == "copy":
+            value = deepcopy(_get(document, operation["from"]))
+            document = _add(document, path, value)
+        elif op == "test":
+            if _get(document, path) != operation["value"]:
+                raise ValueError(f'>>> Test of "{path}" failed.')
+        else:
+            raise ValueError(f'>>> Unknown operation "{op}".')
+    return document
+
+
+def patch_json(
+    file_path: str,
+    operations: List[dict],
+    *,
+    sync: bool = False,
+    compact: bool = False,
+) -> Any:
+    """
+    Applies a list of changes in the JSON Patch format to a JSON file and writes it
+    with "write_atomic". If any operation fails, the file is not changed.
+
+    >>> from snakypy import helpers
+    >>> helpers.files.patch_json('/tmp/file.json', [
+    ...     {"op": "add", "path": "/servers/-", "value": "10.0.0.2"},
+    ...     {"op": "remove", "path": "/debug"},
+    ... ])
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        operations (list): Operations, as in "apply_patch".
+
+        sync (bool): Also flushes the file to the disk with "fsync". (default: {False})
+
+        compact (bool): Writes the JSON without indentation and spaces. (default: {False})
+
+    Returns:
+        [Any] -- The document updated.
+    """
+    document = apply_patch(read_json(file_path), operations)
+    content = get_json_backend().dumps(document, None if compact else 2)
+    write_atomic(content, file_path, sync=sync, encoding="utf-8")
+    return document
+
+
+@contextmanager
+def _flock(
+    lock_path: str, shared: bool, timeout: Optional[float], retry_interval: float
+) -> Iterator[None]:
+    """
+    Holds an advisory lock ("flock") on "lock_path", created if it does not exist.
+    Without a timeout, waits in the kernel. Otherwise, tries again with exponential
+    backoff, from "retry_interval" up to 16 times it, until the timeout.
+    """
+    if fcntl is None:
+        raise OSError(">>> File locking requires the fcntl module (Unix only).")
+    mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    fd = os_open(lock_path, O_RDWR | O_CREAT, 0o666)
+    try:
+        if timeout is None:
+            fcntl.flock(fd, mode)
+        else:
+            deadline = monotonic() + timeout
+            delay = retry_interval
+            while True:
+                try:
+                    fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f">>> Could not lock {lock_path} in {timeout} seconds."
+                        )
+                    sleep(min(delay, remaining))
+                    delay = min(delay * 2, retry_interval * 16)
+        yield
+    finally:
+        # Closing the descriptor also releases the lock.
+        close(fd)
+
+
+@contextmanager
+def json_transaction(
+    file_path: str,
+    *,
+    shared: bool = False,
+    timeout: Optional[float] = None,
+    retry_interval: float = 0.01,
+    sync: bool = False,
+    compact: bool = False,
+) -> Iterator[dict]:
+    """
+    Reads a JSON file under an advisory lock shared by the processes that use this
+    function, so that concurrent read-modify-write cycles do not lose updates.
+
+    In the exclusive mode (the default), the lock is held while the block runs and the
+    dictionary yielded, changed in place, is written with "write_atomic" at the end. If
+    the block raises an exception, nothing is written. If the file does not exist, the
+    block receives an empty dictionary and the file is created.
+
+    In the shared mode, the file is only read: the lock is released as soon as the file
+    is read, before the block runs, so many readers never wait for each other, only
+    for a writer.
+
+    The lock is taken on a "<file>.lock" file next to the document, which is kept,
+    since the document itself is replaced at each write. It only works on Unix.
+
+    >>> from snakypy.helpers.files import json_transaction
+    >>> with json_transaction('/var/lib/app/state.json', timeout=5) as state:
+    ...     state["counter"] = state.get("counter", 0) + 1
+    >>> with json_transaction('/var/lib/app/state.json', shared=True) as state:
+    ...     print(state["counter"])
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        shared (bool): Takes a shared lock, only to read the file. (default: {False})
+
+        timeout (float): Maximum time, in seconds, to wait for the lock. If None, waits
+                         forever. (default: {None})
+
+        retry_interval (float): With a timeout, first interval between two attempts to take
+                                the lock. It doubles after each attempt. (default: {0.01})
+
+        sync (bool): Also flushes the file to the disk with "fsync". (default: {False})
+
+        compact (bool): Writes the JSON without indentation and spaces. (default: {False})
+
+    Returns:
+        [dict] -- The content of the file.
+    """
+    lock_path = f"{file_path}.lock"
+    if shared:
+        with _flock(lock_path, True, timeout, retry_interval):
+            data = read_json(file_path)
+        yield data
+        return
+
+    with _flock(lock_path, False, timeout, retry_interval):
+        data = read_json(file_path) if exists(file_path) else {}
+        yield data
+        content = get_json_backend().dumps(data, None if compact else 2)
+        write_atomic(content, file_path, sync=sync, encoding="utf-8")
+
+
+class JsonJournal:
+    """
+    JSON file updated by an append-only journal. Each change is a JSON Patch appended
+    as one line to a JSON Lines file next to the document, so its cost depends on the
+    size of the change, not of the document. The journal is merged into the document
+    every "compact_every" changes, or when "compact" is called.
+
+    The journal starts with the identity (inode, size and mtime) of the document it
+    applies to. Since the compaction replaces the document with a new file, a journal
+    left behind by an interrupted compaction is recognized and discarded.
+
+    The document is kept in memory, so there must be only one writer at a time.
+
+    >>> from snakypy.helpers.files import JsonJournal
+    >>> state = JsonJournal('/var/lib/app/state.json', compact_every=500)
+    >>> state.patch([{"op": "replace", "path": "/counter", "value": 10}])
+    >>> state.read()["counter"]
+    10
+    >>> state.compact()
+
+    Args:
+        file_path (str): Path of the JSON document. If it does not exist, it is created empty.
+
+        compact_every (int): Number of changes in the journal that triggers the compaction.
+                             (default: {1000})
+
+        sync (bool): Flushes each change to the disk with "fsync". (default: {False})
+    """
+
+    def __init__(
+        self, file_path: str, *, compact_every: int = 1000, sync: bool = False
+    ):
+        self.file_path = file_path
+        self.journal = f"{file_path}.jsonl"
+        self.compact_every = compact_every
+        self.sync = sync
+        self._document: Any = None
+        self._pending = 0
+        if not exists(file_path):
+            write_atomic("{}", file_path, sync=sync, encoding="utf-8")
+
+    def _identity(self) -> list:
+        info = stat(self.file_path)
+        return [info.st_ino, info.st_size, info.st_mtime_ns]
+
+    def _load(self) -> Any:
+        document = read_json(self.file_path)
+        self._document, self._pending = document, 0
+        lines = [""]
+        if exists(self.journal):
+            with open(self.journal, encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("document") != self._identity():
+            # No journal, or one already merged into the document.
+            self._reset()
+            return document
+
+        # Every complete line ends with a line break, so the last item is either
+        # empty or a line cut by an interruption of the writer.
+        for line in lines[1:-1]:
+            document = apply_patch(document, get_json_backend().loads(line))
+            self._pending += 1
+        self._document = document
+        if lines[-1]:
+            self.compact()
+        return document
+
+    def _reset(self) -> None:
+        header = json.dumps({"document": self._identity()})
+        write_atomic(header + "\n", self.journal, sync=self.sync, encoding="utf-8")
+
+    def read(self) -> Any:
+        """
+        Returns the document with all the changes applied. The object returned is the
+        one kept in memory, so it must not be changed directly, only through "patch".
+        """
+        if self._document is None:
+            return self._load()
+        return self._document
+
+    def patch(self, operations: List[dict]) -> None:
+        """
+        Applies a list of changes in the JSON Patch format and appends it to the journal.
+        If an operation fails, nothing is written.
+
+        Args:
+            operations (list): Operations, as in "apply_patch".
+        """
+        document = self.read()
+        try:
+            self._document = apply_patch(document, operations)
+        except Exception:
+            # The document in memory may be partially changed: read it again later.
+            self._document = None
+            raise
+        with open(self.journal, "a", encoding="utf-8") as f:
+            f.write(get_json_backend().dumps(operations, None) + "\n")
+            if self.sync:
+                f.flush()
+                fsync(f.fileno())
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Writes the document with all the changes and empties the journal.
+        """
+        document = self.read()
+        content = get_json_backend().dumps(document, 2)
+        write_atomic(content, self.file_path, sync=self.sync, encoding="utf-8")
+        self._reset()
+        self._pending = 0
+
+
+# Structural characters and strings, the only tokens that delimit the elements. A
+# lone quote is a string not yet complete in the buffer.
+_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|"|[\[\]{},]', re.DOTALL)
+
+
+def _projector(fields: Optional[Iterable[str]]) -> Callable[[bytes], Any]:
+    """
+    Returns the function that decodes an element, keeping only the "fields" of the
+    objects. With msgspec, the other keys are skipped by the decoder itself. With the
+    other backends, each element is decoded whole and then filtered, since cutting the
+    other keys out with "_TOKENS" in Python is several times slower than the decoder.
+    """
+    backend = get_json_backend()
+    if fields is None:
+        return backend.loads
+    fields = tuple(fields)
+
+    if backend.name == "msgspec":
+        import msgspec
+
+        names = [f"f{i}" for i in range(len(fields))]
+        projection = msgspec.defstruct(
+            "Projection",
+            [(name, Any, msgspec.UNSET) for name in names],
+            rename=dict(zip(names, fields)),
+        )
+        decoder = msgspec.json.Decoder(projection)
+
+        def project_msgspec(data: bytes) -> Any:
+            try:
+                values = msgspec.structs.astuple(decoder.decode(data))
+            except msgspec.ValidationError:
+                # Not an object: nothing to project.
+                return backend.loads(data)
+            return {
+                field: value
+                for field, value in zip(fields, values)
+                if value is not msgspec.UNSET
+            }
+
+        return project_msgspec
+
+    def project(data: bytes) -> Any:
+        element = backend.loads(data)
+        if isinstance(element, dict):
+            return {field: element[field] for field in fields if field in element}
+        return element
+
+    return project
+
+
+def iter_json(
+    file_path: str,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    chunk_size: int = 65536,
+) -> Iterator:
+    """
+    Reads a JSON file whose top level is an array and yields its elements one by one,
+    so only one element is kept in memory at a time, whatever the size of the file.
+
+    >>> from snakypy.helpers.files import iter_json
+    >>> for user in iter_json('/tmp/users.json', fields=("id", "name")):
+    ...     print(user)
+    {'id': 1, 'name': 'William'}
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        fields (Iterable): If informed, the objects are returned only with these keys.
+                           The elements that are not objects are returned whole. Only the
+                           "msgspec" backend skips the other keys without building them;
+                           the others decode each element whole, one at a time, and then
+                           discard the other keys.
+
+        chunk_size (int): Size of the blocks read from the file. (default: {65536})
+
+    Returns:
+        [Iterator] -- Yields the elements of the array, in order.
+    """
+    decode = _projector(fields)
+    invalid: Tuple[Type[Exception], ...] = (ValueError, *get_json_backend().errors)
+    buffer = b""
+    # "start" is where the current element begins and "position" is where the
+    # search for the tokens continues. "depth" is 0 before the opening bracket.
+    start = position = depth = 0
+    separated = False
+    try:
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                buffer = buffer[start:] + chunk
+                position -= start
+                start = 0
+                for match in _TOKENS.finditer(buffer, position):
+                    token = match.group()
+                    if token == b'"':
+                        break
+                    if depth == 0:
+                        if token != b"[" or buffer[: match.start()].strip():
+                            raise ValueError("not an array")
+                        depth = 1
+                        start = match.end()
+                    elif depth == 1 and token in (b",", b"]"):
+                        end = match.start()
+                        element = buffer[start:end]
+                        if element.strip():
+                            yield decode(element)
+                        elif token == b"," or separated:
+                            raise ValueError("empty element")
+                        if token == b"]":
+                            return
+                        start, separated = match.end(), True
+                    elif token in (b"[", b"{"):
+                        depth += 1
+                    elif token in (b"]", b"}"):
+                        depth -= 1
+                    position = match.end()
+                else:
+                    position = len(buffer)
+                if not chunk:
+                    raise ValueError("incomplete")
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f">>> File not found {err}")
+    except invalid:
+        raise Exception(f">>> Incorrect Json file structure: {file_path}")
+
+
+def iter_json_lines(
+    file_path: str, *, fields: Optional[Iterable[str]] = None
+) -> Iterator:
+    """
+    Reads a JSON Lines file, with one JSON per line, and yields the records one by one.
+    The blank lines are ignored.
+
+    >>> from snakypy.helpers.files import iter_json_lines
+    >>> for event in iter_json_lines('/var/log/app/events.jsonl', fields=("time", "type")):
+    ...     print(event)
+    {'time': '2021-06-01T10:00:00', 'type': 'login'}
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        fields (Iterable): If informed, the objects are returned only with these keys.
+                           The records that are not objects are returned whole. Only the
+                           "msgspec" backend skips the other keys without building them;
+                           the others decode each record whole, one at a time, and then
+                           discard the other keys.
+
+    Returns:
+        [Iterator] -- Yields the records, in the order of the file.
+    """
+    decode = _projector(fields)
+    errors = get_json_backend().errors
+    try:
+        with open(file_path, "rb") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = decode(line)
+                except errors:
+                    raise Exception(
+                        f">>> Incorrect Json file structure: {file_path}, line {number}"
+                    )
+                yield record
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f">>> File not found {err}")
+
+
+__all__ = [
+    "read_json",
+    "create_json",
+    "update_json",
+    "apply_patch",
+    "patch_json",
+    "json_transaction",
+    "JsonJournal",
+    "iter_json",
+    "iter_json_lines",
+]
@@ -0,0 +1,128 @@
+import json
+from typing import Any, Callable, NamedTuple, Optional, Tuple, Type
+
+# Order of preference of the backends, when more than one is installed.
+JSON_BACKENDS = ("orjson", "msgspec", "ujson", "json")
+
+
+class JsonBackend(NamedTuple):
+    """
+    Library used by "snakypy.helpers.files.json" to read and write JSON.
+
+    Attributes:
+        name (str): Name of the library.
+
+        loads (Callable): Converts the bytes or text of a JSON to an object.
+
+        dumps (Callable): Converts an object to the text of a JSON. Receives the object
+                          and the indentation, or None for a compact output.
+
+        errors (tuple): Exceptions raised by "loads" for an invalid JSON.
+    """
+
+    name: str
+    loads: Callable[[Any], Any]
+    dumps: Callable[[Any, Optional[int]], str]
+    errors: Tuple[Type[Exception], ...]
+
+
+def _json_dumps(obj: Any, indent: Optional[int] = None) -> str:
+    if indent is None:
+        return json.dumps(obj, separators=(",", ":"))
+    return json.dumps(obj, indent=indent, separators=(",", ": "))
+
+
+def _load(name: str) -> JsonBackend:
+    if name == "json":
+        return JsonBackend("json", json.loads, _json_dumps, (ValueError,))
+
+    if name == "orjson":
+        import orjson
+
+        def orjson_dumps(obj: Any, indent: Optional[int] = None) -> str:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent == 2:
+                option |= orjson.OPT_INDENT_2
+            elif indent is not None:
+                # orjson only indents with 2 spaces.
+                return _json_dumps(obj, indent)
+            return orjson.dumps(obj, option=option).decode()
+
+        return JsonBackend("orjson", orjson.loads, orjson_dumps, (ValueError,))
+
+    if name == "msgspec":
+        import msgspec
+
+        def msgspec_dumps(obj: Any, indent: Optional[int] = None) -> str:
+            data = msgspec.json.encode(obj)
+            if indent is not None:
+                data = msgspec.json.format(data, indent=indent)
+            return data.decode()
+
+        return JsonBackend(
+            "msgspec",
+            msgspec.json.decode,
+            msgspec_dumps,
+            (ValueError, msgspec.DecodeError),
+        )
+
+    if name == "ujson":
+        import ujson
+
+        def ujson_dumps(obj: Any, indent: Optional[int] = None) -> str:
+            return ujson.dumps(obj, indent=indent or 0, escape_forward_slashes=False)
+
+        return JsonBackend("ujson", ujson.loads, ujson_dumps, (ValueError,))
+
+    raise ValueError(
+        f'>>> Unknown JSON backend "{name}". Options: {", ".join(JSON_BACKENDS)}'
+    )
+
+
+def _default() -> JsonBackend:
+    for name in JSON_BACKENDS:
+        try:
+            return _load(name)
+        except ImportError:
+            continue
+    return _load("json")
+
+
+_backend = _default()
+
+
+def get_json_backend() -> JsonBackend:
+    """
+    Returns the backend used by the JSON functions of "snakypy.helpers.files".
+
+    >>> from snakypy.helpers.files import get_json_backend
+    >>> get_json_backend().name
+    'orjson'
+    """
+    return _backend
+
+
+def set_json_backend(name: Optional[str] = None) -> JsonBackend:
+    """
+    Chooses the library used by the JSON functions of "snakypy.helpers.files". By
+    default, the fastest one installed is used, in the order of "JSON_BACKENDS", with
+    the "json" module of the standard library as the fallback.
+
+    >>> from snakypy.helpers.files import set_json_backend
+    >>> set_json_backend("json").name
+    'json'
+    >>> set_json_backend().name
+    'orjson'
+
+    Args:
+        name (str): "orjson", "msgspec", "ujson" or "json". If None, the default is restored.
+
+    Returns:
+        [JsonBackend] -- The backend chosen.
+    """
+    global _backend
+    _backend = _default() if name is None else _load(name)
+    return _backend
+
+
+__all__ = ["JSON_BACKENDS", "JsonBackend", "get_json_backend", "set_json_backend"]
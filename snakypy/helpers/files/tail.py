@@ -0,0 +1,221 @@
+import platform
+from contextlib import suppress
+from locale import getpreferredencoding
+from os import SEEK_END, close, fsencode, read, stat
+from select import select
+from time import monotonic, sleep
+from typing import Any, Iterator, List, Optional
+
+# Events of inotify that wake "follow": IN_MODIFY | IN_ATTRIB | IN_MOVE_SELF | IN_DELETE_SELF
+_IN_EVENTS = 0x00000002 | 0x00000004 | 0x00000800 | 0x00000400
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+def _decode(lines: List[bytes], binary: bool, encoding: Optional[str]) -> list:
+    if binary:
+        return lines
+    encoding = encoding or getpreferredencoding(False)
+    return [line.rstrip(b"\r").decode(encoding) for line in lines]
+
+
+def _read_back(f: Any, position: int, breaks: int, block_size: int) -> bytes:
+    """
+    Reads a binary file backwards, in blocks, from "position" until "breaks" line breaks
+    are found or the beginning of the file is reached.
+    """
+    data = b""
+    while position > 0 and data.count(b"\n") < breaks:
+        size = min(block_size, position)
+        position -= size
+        f.seek(position)
+        data = f.read(size) + data
+    return data
+
+
+def tail(
+    file_path: str,
+    lines: int = 10,
+    *,
+    binary: bool = False,
+    encoding: Optional[str] = None,
+    block_size: int = 65536,
+) -> list:
+    """
+    Returns the last lines of a text file, like the "tail" command.
+
+    The file is read backwards, in blocks, only until the lines requested are
+    found, so the time does not depend on the size of the file.
+
+    >>> from snakypy.helpers.files import tail
+    >>> tail('/var/log/syslog', 2)
+    ['Jun  1 10:00:01 host CRON[100]: session opened', 'Jun  1 10:00:02 host CRON[100]: session closed']
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        lines (int): Number of lines to be returned. (default: {10})
+
+        binary (bool): If True, the lines are returned as bytes, without decoding. (default: {False})
+
+        encoding (str): Encoding of the file. (default: the encoding of the system, as "open")
+
+        block_size (int): Size of the blocks read from the end of the file. (default: {65536})
+
+    Returns:
+        [list] -- The lines, in the order of the file, without the line breaks.
+    """
+    if lines <= 0:
+        return []
+    try:
+        with open(file_path, "rb") as f:
+            # A line break at the end of the file does not start a new line.
+            data = _read_back(f, f.seek(0, SEEK_END), lines + 1, block_size)
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f'>>> File "{file_path}" does not exist. {err}')
+
+    if not data:
+        return []
+    if data.endswith(b"\n"):
+        data = data[:-1]
+    return _decode(data.split(b"\n")[-lines:], binary, encoding)
+
+
+class _PollWaiter:
+    """Waits for a change in the file by just sleeping."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        sleep(min(timeout, self.interval))
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWaiter:
+    """Waits for a change in the file using inotify, through the C library."""
+
+    def __init__(self, file_path: str):
+        # Imported here, since "ctypes" is slow to import.
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, fsencode(file_path), _IN_EVENTS) < 0:
+            close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout: float) -> None:
+        if select([self.fd], [], [], timeout)[0]:
+            with suppress(BlockingIOError):
+                while read(self.fd, 4096):
+                    pass
+
+    def close(self) -> None:
+        close(self.fd)
+
+
+def _waiter(file_path: str, interval: float) -> Any:
+    if platform.system() == "Linux":
+        with suppress(OSError, AttributeError):
+            return _InotifyWaiter(file_path)
+    return _PollWaiter(interval)
+
+
+def follow(
+    file_path: str,
+    lines: int = 0,
+    *,
+    binary: bool = False,
+    encoding: Optional[str] = None,
+    interval: float = 0.5,
+    timeout: Optional[float] = None,
+) -> Iterator:
+    """
+    Follows a text file and yields the lines appended to it, like "tail -f".
+
+    On Linux, the changes are notified by inotify, so the lines are delivered as soon
+    as they are written. On the other systems, the file is checked every "interval"
+    seconds. If the file is truncated or replaced (such as a log rotation), it is
+    read again from the beginning.
+
+    >>> from snakypy.helpers.files import follow
+    >>> for line in follow('/var/log/syslog', lines=10):
+    ...     print(line)
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        lines (int): Number of existing lines at the end of the file to be yielded first. (default: {0})
+
+        binary (bool): If True, the lines are returned as bytes, without decoding. (default: {False})
+
+        encoding (str): Encoding of the file. (default: the encoding of the system, as "open")
+
+        interval (float): Maximum time, in seconds, between two checks of the file. (default: {0.5})
+
+        timeout (float): If informed, stops after this many seconds without new lines. (default: {None})
+
+    Returns:
+        [Iterator] -- Yields the complete lines, without the line breaks.
+    """
+    try:
+        f = open(file_path, "rb")
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f'>>> File "{file_path}" does not exist. {err}')
+    waiter = None
+    try:
+        # The existing lines are read from the same descriptor that is followed, so
+        # nothing appended meanwhile is lost. A last line without a line break is
+        # kept as pending, until it is completed.
+        end = f.seek(0, SEEK_END)
+        data = _read_back(f, end, lines + 1, 65536)
+        complete, newline, pending = data.rpartition(b"\n")
+        if newline and lines > 0:
+            for line in _decode(complete.split(b"\n")[-lines:], binary, encoding):
+                yield line
+        f.seek(end)
+        inode = stat(f.fileno()).st_ino
+        waiter = _waiter(file_path, interval)
+        last_line = monotonic()
+        while True:
+            chunk = f.read()
+            if chunk:
+                pending += chunk
+                if b"\n" in pending:
+                    complete, _, pending = pending.rpartition(b"\n")
+                    for line in _decode(complete.split(b"\n"), binary, encoding):
+                        yield line
+                    last_line = monotonic()
+                continue
+
+            with suppress(FileNotFoundError):
+                current = stat(file_path)
+                if current.st_ino != inode or current.st_size < f.tell():
+                    # Rotated or truncated: start over from the beginning.
+                    f.close()
+                    f = open(file_path, "rb")
+                    inode, pending = current.st_ino, b""
+                    waiter.close()
+                    waiter = _waiter(file_path, interval)
+                    continue
+
+            if timeout is not None:
+                remaining = timeout - (monotonic() - last_line)
+                if remaining <= 0:
+                    return
+                waiter.wait(min(interval, remaining))
+            else:
+                waiter.wait(interval)
+    finally:
+        if waiter is not None:
+            waiter.close()
+        f.close()
+
+
+__all__ = ["tail", "follow"]
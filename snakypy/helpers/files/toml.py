@@ -0,0 +1,138 @@
+from typing import Any, Sequence, Union
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ImportError:
+        tomllib = None  # type: ignore[assignment]
+
+from snakypy.helpers.files.cache import cached_read, freeze, thaw
+
+_MISSING = object()
+
+
+def _load(file_path: str) -> Any:
+    """
+    Reads a TOML file with "tomllib" (or "tomli" before Python 3.11), much faster than
+    "tomlkit", which is only used if neither is available.
+    """
+    with open(file_path, "rb") as f:
+        if tomllib is not None:
+            return tomllib.load(f)
+        content = f.read().decode()
+    from tomlkit import parse
+
+    return parse(content)
+
+
+def _load_frozen(file_path: str) -> Any:
+    return freeze(_load(file_path))
+
+
+def _keys(key: Union[str, Sequence[str]]) -> tuple:
+    keys = (key,) if isinstance(key, str) else tuple(key)
+    if not keys:
+        raise KeyError(
+            '>>> Enter the access keys. Must be a tuple. E.g: key=("key1", "key2",...)'
+        )
+    return keys
+
+
+def toml_get(
+    file_path: str,
+    key: Union[str, Sequence[str]],
+    default: Any = _MISSING,
+    *,
+    cache: bool = False,
+) -> Any:
+    """
+    Returns the value of a key of a TOML file, at any depth. The file is read with the
+    parser of the standard library, so the check is cheap enough for hot code,
+    especially with cache=True.
+
+    >>> from snakypy.helpers.files import toml_get
+    >>> toml_get("pyproject.toml", ("tool", "poetry", "version"))
+    '0.3.1'
+    >>> toml_get("pyproject.toml", ("tool", "black", "line-length"), 88, cache=True)
+    88
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        key (tuple): Keys of the tables, from the top level to the value. A string is a single key.
+
+        default (Any): Value returned if the key does not exist. If not informed, a "KeyError"
+                       is raised.
+
+        cache (bool): Uses the cache of "read_file" and "read_json", validated by the inode,
+                      mtime and size of the file. The tables and arrays returned cannot be
+                      changed. (default: {False})
+
+    Returns:
+        [Any] -- The value of the key.
+    """
+    keys = _keys(key)
+    value = cached_read("toml", file_path, _load_frozen) if cache else _load(file_path)
+    for name in keys:
+        try:
+            value = value[name]
+        except (KeyError, TypeError, IndexError):
+            if default is _MISSING:
+                raise KeyError(f'>>> Key "{".".join(keys)}" not found in {file_path}')
+            return default
+    return value
+
+
+def toml_set(
+    file_path: str,
+    key: Union[str, Sequence[str]],
+    value: Any,
+    *,
+    cache: bool = False,
+) -> bool:
+    """
+    Changes the value of a key of a TOML file, at any depth, creating the missing tables.
+    The current value is checked first with the fast parser, and "tomlkit" is only used,
+    to keep the format and the comments of the file, if the value is different.
+
+    >>> from snakypy.helpers.files import toml_set
+    >>> toml_set("pyproject.toml", ("tool", "poetry", "version"), "0.3.2")
+    True
+
+    Args:
+        file_path (str): You must receive the full/absolute file path.
+
+        key (tuple): Keys of the tables, from the top level to the value. A string is a single key.
+
+        value (Any): The new value.
+
+        cache (bool): Uses the cache of "toml_get" to check the current value. (default: {False})
+
+    Returns:
+        [bool] -- True if the file was changed, False if the value was already the same.
+    """
+    keys = _keys(key)
+    absent = object()
+    current = toml_get(file_path, keys, absent, cache=cache)
+    if current is not absent and thaw(current) == value:
+        return False
+
+    from tomlkit import dumps, parse, table
+
+    from snakypy.helpers.files.generic import write_atomic
+
+    with open(file_path, encoding="utf-8") as f:
+        document = parse(f.read())
+    container = document
+    for name in keys[:-1]:
+        if name not in container:
+            container[name] = table()
+        container = container[name]
+    container[keys[-1]] = value
+    write_atomic(dumps(document), file_path, encoding="utf-8")
+    return True
+
+
+__all__ = ["toml_get", "toml_set"]
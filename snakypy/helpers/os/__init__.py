@@ -1,2 +1,2 @@
 from .modifiers import wtm_state
-from .removals import cleaner, remove_objects, rmdir_blank
+from .removals import cleaner, remove_objects, remove_trees, rmdir_blank
@@ -1,9 +1,18 @@
+import os
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
-from os import listdir, remove, rmdir, walk
+from os import O_RDONLY, close, fstat, remove, rmdir, scandir, unlink, walk
 from os.path import isdir, join
 from shutil import rmtree
-from typing import Any
+from threading import Condition
+from typing import Any, Dict, List, Optional, Tuple
+
+from snakypy.helpers.path import walk_entries
+
+# Removal relative to the descriptor of the folder ("unlinkat"), where supported.
+_DIR_FD = os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd
+_DIRECTORY = getattr(os, "O_DIRECTORY", 0)
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
 
 
 def remove_objects(*, objects: tuple = ()) -> None:
@@ -24,26 +33,200 @@ def remove_objects(*, objects: tuple = ()) -> None:
             rmtree(item, ignore_errors=True) if isdir(item) else remove(item)
 
 
-def rmdir_blank(path: str) -> None:
+def rmdir_blank(path: str, *, dry_run: bool = False) -> List[str]:
     """
     Removes folders recursively if they are empty from a
     certain path.
 
+    The tree is read in a single pass, with one "scandir" per folder, counting the
+    entries of each folder. The folders are then visited bottom-up and each one
+    removed is discounted from its parent, so the folders that only contain empty
+    folders are removed as well, in a whole chain. The path itself is not removed.
+
     >>> from snakypy import helpers
     >>> helpers.os.rmdir_blank("/tmp/program_x")
+    ['/tmp/program_x/cache/a/b', '/tmp/program_x/cache/a', '/tmp/program_x/cache']
+    >>> helpers.os.rmdir_blank("/tmp/program_x", dry_run=True)
 
     Args:
         path (str): Must receive a string in the form of path.
+
+        dry_run (bool): If True, nothing is removed, only reported. (Default: False)
+
+    Returns:
+        [list] -- The folders removed (or that would be removed), from the deepest to the top.
+    """
+    order = []
+    remaining: Dict[str, int] = {}
+    parents: Dict[str, str] = {}
+    for root, dirs, files in walk_entries(path):
+        order.append(root)
+        remaining[root] = len(dirs) + len(files)
+        for entry in dirs:
+            if not entry.is_symlink():
+                parents[entry.path] = root
+
+    removed = []
+    # The walk lists each folder before its subfolders, so in reverse order the
+    # subfolders of a folder are all visited before it.
+    for folder in reversed(order[1:]):
+        if remaining[folder]:
+            continue
+        if not dry_run:
+            try:
+                rmdir(folder)
+            except PermissionError:
+                raise PermissionError("No permission to remove empty folders")
+            except Exception:
+                raise Exception("It was not possible to clean empty folders.")
+        removed.append(folder)
+        remaining[parents[folder]] -= 1
+    return removed
+
+
+class _Folder:
+    """Folder being removed by "remove_trees", waiting for its subfolders."""
+
+    __slots__ = ("path", "parent", "pending", "failed", "identity")
+
+    def __init__(
+        self,
+        path: str,
+        parent: Optional["_Folder"],
+        identity: Optional[Tuple[int, int]] = None,
+    ):
+        self.path = path
+        self.parent = parent
+        # Its own listing plus one for each subfolder not yet removed.
+        self.pending = 1
+        self.failed = False
+        # Device and inode seen in the listing of the parent, checked when it is opened.
+        self.identity = identity
+
+
+def remove_trees(*paths: str, max_workers: Optional[int] = None) -> Dict[str, OSError]:
     """
-    for r, d, f in walk(path, topdown=False):
-        for folder in d:
-            if len(listdir(join(r, folder))) == 0:
+    Removes folders and all their content, like "shutil.rmtree", in parallel.
+
+    All the folders of the trees are processed by a single pool of threads: each folder
+    is opened and checked to be the same folder (device and inode) seen in the listing
+    of its parent, so a folder replaced by a link during the removal is never followed,
+    and only one descriptor per thread is open at a time. It is read with "scandir", its
+    files are removed relative to its descriptor ("unlinkat", where supported) and its
+    subfolders are sent to the pool. A folder is removed by the thread that finishes its
+    last subfolder, so no thread ever waits for another. The symbolic links are removed,
+    not followed.
+
+    >>> from snakypy.helpers.os import remove_trees
+    >>> remove_trees("/tmp/build", "/tmp/cache", max_workers=8)
+    {}
+
+    Args:
+        paths (str): Folders to be removed. Files and links are just removed.
+
+        max_workers (int): Maximum number of threads. (Default: the default of "ThreadPoolExecutor")
+
+    Returns:
+        [dict] -- The errors, as {path: OSError}, of the objects that could not be removed.
+                  The folders that contain them are kept, without an error of their own.
+    """
+    errors: Dict[str, OSError] = {}
+    done = Condition()
+    remaining = [len(paths)]
+
+    def finish(folder: _Folder) -> None:
+        # Removes the folders whose subfolders are all finished, up the tree.
+        node: Optional[_Folder] = folder
+        while node is not None:
+            with done:
+                node.pending -= 1
+                if node.pending:
+                    return
+                failed = node.failed
+            if not failed:
                 try:
-                    rmdir(join(r, folder))
-                except PermissionError:
-                    raise PermissionError("No permission to remove empty folders")
-                except Exception:
-                    raise Exception("It was not possible to clean empty folders.")
+                    rmdir(node.path)
+                except OSError as err:
+                    failed = True
+                    with done:
+                        errors[node.path] = err
+            parent = node.parent
+            if parent is None:
+                with done:
+                    remaining[0] -= 1
+                    done.notify_all()
+            elif failed:
+                with done:
+                    parent.failed = True
+            node = parent
+
+    def fail(folder: _Folder, path: str, err: OSError) -> None:
+        with done:
+            errors[path] = err
+            folder.failed = True
+
+    def open_folder(folder: _Folder) -> int:
+        fd = os.open(folder.path, O_RDONLY | _DIRECTORY | _NOFOLLOW)
+        if folder.identity is not None:
+            info = fstat(fd)
+            if (info.st_dev, info.st_ino) != folder.identity:
+                close(fd)
+                raise OSError(
+                    f'>>> The folder "{folder.path}" was replaced during the removal.'
+                )
+        return fd
+
+    def clear(folder: _Folder) -> None:
+        subfolders = []
+        try:
+            if _DIR_FD:
+                fd = open_folder(folder)
+                try:
+                    device = fstat(fd).st_dev
+                    with scandir(fd) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                path = join(folder.path, entry.name)
+                                subfolders.append((path, (device, entry.inode())))
+                                continue
+                            try:
+                                unlink(entry.name, dir_fd=fd)
+                            except OSError as err:
+                                fail(folder, join(folder.path, entry.name), err)
+                finally:
+                    close(fd)
+            else:
+                with scandir(folder.path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subfolders.append((entry.path, None))
+                            continue
+                        try:
+                            unlink(entry.path)
+                        except OSError as err:
+                            fail(folder, entry.path, err)
+        except OSError as err:
+            fail(folder, folder.path, err)
+        with done:
+            folder.pending += len(subfolders)
+        for path, identity in subfolders:
+            executor.submit(clear, _Folder(path, folder, identity))
+        finish(folder)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for path in paths:
+            if isdir(path) and not os.path.islink(path):
+                executor.submit(clear, _Folder(path, None))
+                continue
+            try:
+                unlink(path)
+            except OSError as err:
+                errors[path] = err
+            with done:
+                remaining[0] -= 1
+        with done:
+            done.wait_for(lambda: remaining[0] == 0)
+    return errors
 
 
 def cleaner(directory, *file: Any, level: int = 0) -> int:
@@ -74,7 +257,8 @@ def cleaner(directory, *file: Any, level: int = 0) -> int:
                                Value 2 = If this value is set, the function revokes the unitary \
                                file exclusion option as well, however, it will exclude all \
                                subdirectories of the root directory, except the files contained \
-                               in the root.
+                               in the root. An "OSError" listing the objects that could not be \
+                               removed is raised, after all the others are removed.
     """
 
     data = next(walk(directory))
@@ -87,11 +271,10 @@ def cleaner(directory, *file: Any, level: int = 0) -> int:
 
     #: DANGER!
     if level == 2:
-        # r: root, r: directory, f: files
-        for r, d, f in walk(directory, topdown=False):
-            for item in d:
-                with ThreadPoolExecutor() as executor:
-                    executor.submit(rmtree, join(r, item))
+        errors = remove_trees(*(join(data[0], d) for d in data[1]))
+        if errors:
+            details = "; ".join(f"{path}: {err}" for path, err in errors.items())
+            raise OSError(f">>> It was not possible to remove: {details}")
         return 2
 
     try:
@@ -104,4 +287,4 @@ def cleaner(directory, *file: Any, level: int = 0) -> int:
         raise FileNotFoundError(msg, err)
 
 
-__all__ = ["rmdir_blank", "remove_objects", "cleaner"]
+__all__ = ["rmdir_blank", "remove_objects", "remove_trees", "cleaner"]
@@ -1,4 +1,6 @@
+from os import scandir
 from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
 
 
 def create(*args: str) -> None:
@@ -25,3 +27,60 @@ def create(*args: str) -> None:
         )
     except Exception:
         raise Exception(f">>> An error occurred while creating directory: {args}")
+
+
+def walk_entries(
+    top: str, onerror: Optional[Callable[[OSError], Any]] = None
+) -> Iterator:
+    """
+    Walk a directory tree top-down with a single "scandir" per directory.
+
+    Works like "os.walk", but yields the "DirEntry" objects themselves, so the
+    callers can classify each entry using the "d_type" data already returned by
+    the operating system, without an extra "stat" per file. As in "os.walk", the
+    "dirs" list can be changed in place to prune the descent, and symbolic links
+    to directories are listed but not followed.
+
+    >>> from snakypy.helpers.path import walk_entries
+    >>> for root, dirs, files in walk_entries("/tmp"):
+    ...     print(root, [entry.name for entry in files])
+
+    Args:
+        top (str): Root directory of the walk.
+
+        onerror (Callable): Optional function called with the "OSError" raised when
+                            a directory cannot be read. By default the error is ignored.
+
+    Returns:
+        [Iterator] -- Tuples (root, dirs, files) where "dirs" and "files" are lists of "DirEntry".
+    """
+    stack = [top]
+    while stack:
+        root = stack.pop()
+        dirs: list = []
+        files: list = []
+        try:
+            with scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        dirs.append(entry)
+                    else:
+                        files.append(entry)
+        except OSError as err:
+            if onerror is not None:
+                onerror(err)
+            continue
+
+        yield root, dirs, files
+
+        # Reversed, so the subdirectories are visited in the same order as "os.walk".
+        for entry in reversed(dirs):
+            try:
+                if not entry.is_symlink():
+                    stack.append(entry.path)
+            except OSError:
+                continue
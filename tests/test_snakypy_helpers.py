@@ -1,7 +1,14 @@
 """Tests for `snakypy` package."""
+
+import copy
+import json
 import os
+import pickle
+import platform
+import time
 from contextlib import suppress
 from os.path import exists, join
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -19,19 +26,58 @@ from snakypy.helpers.calcs import (
     percentage,
     simple_interest,
 )
-from snakypy.helpers.catches import extension
-from snakypy.helpers.catches.finders import find_objects, is_tool, tools_requirements
+from snakypy.helpers.catches import PathFilter, extension, extensions
+from snakypy.helpers.catches.finders import (
+    extension_histogram,
+    find_objects,
+    find_objects_parallel,
+    find_tools,
+    is_tool,
+    iter_objects,
+    tools_requirements,
+)
+from snakypy.helpers.catches.index import (
+    index_invalidate,
+    index_rebuild,
+    indexed_walk,
+)
 from snakypy.helpers.decorators import silent_errors
 from snakypy.helpers.files import (
+    BackupStore,
+    JsonBackend,
+    JsonJournal,
+    apply_patch,
     backup_file,
+    backup_files,
+    clear_read_cache,
     create_file,
+    create_files,
     create_json,
+    eqversion,
+    file_hash,
+    files_hash,
+    filesize,
+    follow,
+    iter_json,
+    iter_json_lines,
+    iter_lines,
+    json_transaction,
+    map_file,
+    patch_json,
+    read_cache_info,
     read_file,
     read_json,
+    set_json_backend,
+    tail,
+    thaw,
+    toml_get,
+    toml_set,
+    tree_size,
     update_json,
 )
-from snakypy.helpers.os import cleaner, remove_objects, rmdir_blank
+from snakypy.helpers.os import cleaner, remove_objects, remove_trees, rmdir_blank
 from snakypy.helpers.path import create as create_path
+from snakypy.helpers.path import walk_entries
 from snakypy.helpers.subprocess import command, systemctl_is_active
 
 
@@ -44,6 +90,21 @@ def test_versions():
     assert version_doc == version
 
 
+def test_sync_version():
+    with patch("snakypy.helpers.files.eqversion") as eqversion:
+        snakypy.helpers.sync_version()
+    path, version = eqversion.call_args[0]
+    assert os.path.samefile(path, join(os.getcwd(), "pyproject.toml"))
+    assert version == snakypy.helpers.__info__["version"]
+
+
+def test_star_import():
+    namespace: dict = {}
+    exec("from snakypy.helpers import *", namespace)
+    assert {"files", "printer", "eqversion", "sync_version"} <= set(namespace)
+    assert "environ" not in namespace
+
+
 @pytest.fixture
 def base(tmpdir):
     tmp = tmpdir.mkdir("temporary")
@@ -65,6 +126,96 @@ def test_create_file(base):
     return forced
 
 
+def test_create_file_atomic(base):
+    path = join(base["tmp"], base["files"][0])
+    assert create_file("old", path, force=True) is True
+    os.chmod(path, 0o640)
+    assert create_file("new", path, force=True, atomic=True, sync=True) is True
+    assert read_file(path) == "new"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    json_path = join(base["tmp"], base["files"][1])
+    assert create_json({"a": 1}, json_path, atomic=True) is True
+    assert update_json(json_path, {"a": 2}, atomic=True, sync=True) is True
+    assert read_json(json_path) == {"a": 2}
+    assert sorted(os.listdir(base["tmp"])) == sorted(base["files"])
+    # A symbolic link is kept, and the file it points to is replaced.
+    link = join(base["tmp"], "link.json")
+    os.symlink(json_path, link)
+    assert update_json(link, {"a": 3}, atomic=True) is True
+    create_files({link: '{"a": 4}'}, force=True)
+    assert os.path.islink(link)
+    assert read_json(json_path) == {"a": 4}
+
+
+def test_create_files_batch(base):
+    paths = [join(base["tmp"], f"file{i}.txt") for i in range(3)]
+    assert create_files({p: p for p in paths}, sync=True) is True
+    assert [read_file(p) for p in paths] == paths
+    with pytest.raises(FileExistsError):
+        create_files({paths[0]: "new"})
+    missing = join(base["tmp"], "missing", "file.txt")
+    with pytest.raises(Exception):
+        create_files({paths[0]: "new", missing: "new"}, force=True)
+    assert read_file(paths[0]) == paths[0]
+    assert len(os.listdir(base["tmp"])) == 3
+
+
+def test_iter_lines_and_map_file(base):
+    path = join(base["tmp"], base["files"][0])
+    for content in ("", "one", "one\ntwo\n", "one\r\ntwo"):
+        create_file(content, path, force=True)
+        assert list(iter_lines(path)) == read_file(path, split=True)
+    assert list(iter_lines(path, binary=True)) == [b"one\r", b"two"]
+    with map_file(path) as data:
+        assert data.find(b"two") == 5
+        view = memoryview(data)
+        assert view[:3] == b"one"
+        view.release()
+    create_file("", path, force=True)
+    with map_file(path) as data:
+        assert data == b""
+    with pytest.raises(FileNotFoundError):
+        list(iter_lines(join(base["tmp"], "missing.txt")))
+
+
+def test_tail(base):
+    path = join(base["tmp"], base["files"][0])
+    content = "\n".join(f"line {i}" for i in range(1000)) + "\n"
+    create_file(content, path, force=True)
+    assert tail(path, 3, block_size=16) == ["line 997", "line 998", "line 999"]
+    assert tail(path, 2000) == content.split("\n")[:-1]
+    assert tail(path, 1, binary=True) == [b"line 999"]
+    create_file("a\r\nb", path, force=True)
+    assert tail(path, 5) == ["a", "b"]
+    create_file("", path, force=True)
+    assert tail(path) == []
+
+
+def test_follow(base):
+    from threading import Timer
+
+    path = join(base["tmp"], base["files"][0])
+    create_file("old 1\nold 2\n", path, force=True)
+
+    def append():
+        with open(path, "a") as f:
+            f.write("new 1\nnew")
+            f.flush()
+            f.write(" 2\npartial")
+
+    Timer(0.1, append).start()
+    lines = list(follow(path, lines=1, interval=0.05, timeout=0.5))
+    assert lines == ["old 2", "new 1", "new 2"]
+    # A last line without a line break is completed, and nothing appended after the
+    # existing lines were read is lost.
+    create_file("old 1\nold", path, force=True)
+    lines_ = follow(path, lines=1, interval=0.05, timeout=0.5)
+    assert next(lines_) == "old 1"
+    with open(path, "a") as f:
+        f.write(" 2\nnew 1\n")
+    assert list(lines_) == ["old 2", "new 1"]
+
+
 # def test_decorators():
 #     @only_linux
 #     def get_shell():
@@ -89,12 +240,406 @@ def test_backup_copy_and_error(base):
         cleaner(base["tmp"], "*.txt")
 
 
+def test_backup_files_report(base):
+    origins = [join(base["tmp"], f"file{i}.conf") for i in range(3)]
+    for origin in origins:
+        create_file(origin * 100, origin, force=True)
+    backup_dir = base["tmp"].mkdir("backup")
+    files = {o: join(backup_dir, os.path.basename(o)) for o in origins}
+    missing = join(base["tmp"], "missing.conf")
+    files[missing] = join(backup_dir, "missing.conf")
+    report = backup_files(files, max_workers=2)
+    assert [report[o].status for o in origins] == ["copied"] * 3
+    assert read_file(files[origins[0]]) == origins[0] * 100
+    assert report[missing].status == "error"
+    assert isinstance(report[missing].error, FileNotFoundError)
+    create_file("changed", origins[1], force=True)
+    report = backup_files(files)
+    assert [report[o].status for o in origins] == ["skipped", "copied", "skipped"]
+    report = backup_files({origins[0]: origins[0]})
+    assert report[origins[0]].destiny.startswith(f"{origins[0]}__BACKUP-")
+    # A copy that fails keeps the previous backup intact.
+    create_file("changed again", origins[1], force=True)
+
+    def broken_copy(fsrc, fdst):
+        fdst.write(b"half")
+        raise OSError("disk full")
+
+    with patch("snakypy.helpers.files.backup._copy_data", broken_copy):
+        report = backup_files({origins[1]: files[origins[1]]})
+    assert report[origins[1]].status == "error"
+    assert read_file(files[origins[1]]) == "changed"
+    assert not [name for name in os.listdir(backup_dir) if name.endswith(".tmp")]
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="Copy methods of Linux")
+def test_backup_files_fallback(base):
+    origin = join(base["tmp"], "origin.conf")
+    destiny = join(base["tmp"], "destiny.conf")
+    create_file("content" * 100, origin)
+
+    def refuse(*args):
+        raise OSError("not supported")
+
+    # Calls that copy nothing fall back to the next method, and at last to a plain copy.
+    with patch("fcntl.ioctl", refuse), patch("os.sendfile", lambda *args: 0):
+        with patch("os.copy_file_range", lambda *args: 0, create=True):
+            report = backup_files({origin: destiny})
+    assert report[origin].status == "copied"
+    assert read_file(destiny) == "content" * 100
+    assert report[origin].method == "copy"
+    # A copy that stops in the middle is an error.
+    create_file("changed" * 100, origin, force=True)
+    with patch("fcntl.ioctl", refuse):
+        with patch("os.copy_file_range", refuse, create=True):
+            with patch(
+                "os.sendfile", lambda out, src, offset, count: 0 if offset else 10
+            ):
+                report = backup_files({origin: destiny})
+    assert report[origin].status == "error"
+    assert read_file(destiny) == "content" * 100
+
+
+def test_backup_store(base):
+    store = BackupStore(join(base["tmp"], "store"))
+    path = join(base["tmp"], base["files"][0])
+    other = join(base["tmp"], "other.txt")
+    create_file("version 1", path)
+    create_file("version 1", other)
+    first, copy = store.backup(path, other)
+    assert first.digest == copy.digest
+    store.backup(path)
+    create_file("version 2", path, force=True)
+    second = store.backup(path)[0]
+    assert second.digest != first.digest
+    blobs = [n for _, _, names in os.walk(store.objects) for n in names]
+    assert len(blobs) == 2
+    assert len(store.history(path)) == 3
+    restored = join(base["tmp"], "restored.txt")
+    assert store.restore(path, restored) == second
+    assert read_file(restored) == "version 2"
+    assert store.prune(keep_last=1) == 2
+    assert store.entries() == [copy, second]
+    store.restore(other)
+    assert read_file(other) == "version 1"
+    assert store.prune(keep_last=0, keep_days=0) == 2
+    assert [n for _, _, names in os.walk(store.objects) for n in names] == []
+    with pytest.raises(FileNotFoundError):
+        store.restore(path)
+
+
+def test_file_hash(base):
+    import hashlib
+
+    path = join(base["tmp"], base["files"][0])
+    create_file("Snakypy" * 1000, path)
+    expected = hashlib.sha256(b"Snakypy" * 1000).hexdigest()
+    assert file_hash(path, buffer_size=1000) == expected
+    assert file_hash(path, "blake2b") == hashlib.blake2b(b"Snakypy" * 1000).hexdigest()
+    assert file_hash(path, cache=True) == expected
+    with open(path, "r+") as f:
+        f.write("X")
+    os.utime(path, ns=(1, 1))
+    assert file_hash(path, cache=True) != expected
+    missing = join(base["tmp"], "missing.txt")
+    assert files_hash([path, missing], "md5", max_workers=2) == {
+        path: file_hash(path, "md5"),
+        missing: None,
+    }
+
+
+def test_tree_size(base):
+    root = str(base["tmp"])
+    sub = join(root, "a", "b")
+    create_path(sub)
+    create_file("x" * 1024, join(root, "one.txt"))
+    create_file("y" * 2048, join(sub, "two.txt"))
+    os.link(join(sub, "two.txt"), join(root, "a", "link.txt"))
+    os.symlink(sub, join(root, "dir_link"))
+    for parallel in (False, True):
+        sizes = tree_size(root, parallel=parallel)
+        assert sizes["files"] == 3
+        link = os.lstat(join(root, "dir_link")).st_size
+        assert sizes["size"] == 1024 + 2048 + link
+        # The hardlinked file is counted once, in the first folder walked.
+        assert sizes["directories"][join(root, "a")] == 2048
+        assert sizes["directories"][root] == sizes["size"]
+    assert tree_size(root, "kb")["directories"][join(root, "a")] == 2.0
+    assert filesize([join(root, "one.txt"), join(sub, "two.txt")], "kb") == [1.0, 2.0]
+    assert filesize(Path(root, "one.txt"), "kb") == 1.0
+    assert filesize(join(root, "one.txt").encode(), "kb") == 1.0
+    with pytest.raises(FileNotFoundError):
+        tree_size(join(root, "missing"))
+
+
+def test_json_backend(base):
+    path = join(base["tmp"], base["files"][1])
+    content = {"a": [1, {"b": "Olá"}], "c": None}
+    try:
+        for name in ("json", None):
+            backend = set_json_backend(name)
+            assert create_json(content, path, force=True, compact=True) is True
+            assert read_json(path) == content
+            assert update_json(path, content) is True
+            assert read_json(path) == content
+            assert "\n  " in read_file(path)
+        assert set_json_backend("json").dumps(content, None).count(" ") == 0
+        with pytest.raises(ValueError):
+            set_json_backend("unknown")
+    finally:
+        set_json_backend()
+    assert backend.name in ("orjson", "msgspec", "ujson", "json")
+    # The raw text of the fast backends is written as UTF-8, whatever the locale.
+    raw = JsonBackend(
+        "raw",
+        json.loads,
+        lambda obj, indent: json.dumps(obj, ensure_ascii=False),
+        (ValueError,),
+    )
+    with patch("snakypy.helpers.files.json_backend._backend", raw):
+        for atomic in (False, True):
+            assert create_json(content, path, force=True, atomic=atomic) is True
+            with open(path, "rb") as f:
+                assert "Olá".encode("utf-8") in f.read()
+            assert read_json(path) == content
+
+
+def test_read_cache(base):
+    clear_read_cache()
+    path = join(base["tmp"], base["files"][1])
+    create_json({"a": [1, {"b": 2}]}, path)
+    first = read_json(path, cache=True)
+    assert first == {"a": (1, {"b": 2})}
+    assert read_json(path, cache=True) is first
+    with pytest.raises(TypeError):
+        first["a"][1]["b"] = 3
+    # The frozen content can be copied and pickled, and stays frozen.
+    assert copy.copy(first) is first
+    for clone in (copy.deepcopy(first), pickle.loads(pickle.dumps(first))):
+        assert clone == first
+        assert type(clone) is type(first) and type(clone["a"][1]) is type(first)
+        with pytest.raises(TypeError):
+            clone["a"] = 1
+    first.__init__({"a": 1})
+    assert first == {"a": (1, {"b": 2})}
+    config = thaw(first)
+    config["a"][1]["b"] = 3
+    assert update_json(path, config) is True
+    assert read_json(path, cache=True) == {"a": (1, {"b": 3})}
+    text = read_file(path, cache=True)
+    assert read_file(path, split=True, cache=True) == text.split("\n")
+    info = read_cache_info()
+    assert (info.hits, info.misses, info.entries) == (2, 3, 2)
+    assert info.bytes == 2 * os.stat(path).st_size
+    with patch("snakypy.helpers.files.cache.READ_CACHE_SIZE", info.bytes - 1):
+        clear_read_cache()
+        read_json(path, cache=True)
+        read_file(path, cache=True)
+        assert read_cache_info().entries == 1
+    clear_read_cache()
+    assert read_cache_info()[:4] == (0, 0, 0, 0)
+
+
+def test_iter_json(base):
+    path = join(base["tmp"], base["files"][1])
+    records = [{"id": i, "name": f'"{i}", [x]', "tags": [{"a": i}]} for i in range(50)]
+    with open(path, "w") as f:
+        f.write(json.dumps(records + [7, "]"], indent=2))
+    assert list(iter_json(path, chunk_size=16)) == records + [7, "]"]
+    projected = list(iter_json(path, fields=("id", "missing")))
+    assert projected == [{"id": i} for i in range(50)] + [7, "]"]
+    with open(path, "w") as f:
+        f.write("[1, 2,]")
+    with pytest.raises(Exception, match="Incorrect Json"):
+        list(iter_json(path))
+    with open(path, "w") as f:
+        f.write("\n".join(json.dumps(r) for r in records[:3]) + "\n\n{bad\n")
+    lines = iter_json_lines(path, fields=["name"])
+    assert [next(lines) for _ in range(3)] == [{"name": r["name"]} for r in records[:3]]
+    with pytest.raises(Exception, match="line 5"):
+        next(lines)
+
+
+def test_patch_json(base):
+    path = join(base["tmp"], base["files"][1])
+    create_json({"a": {"b~c": [1, 2]}, "d": 1}, path)
+    operations = [
+        {"op": "add", "path": "/a/b~0c/-", "value": 3},
+        {"op": "add", "path": "/a/b~0c/0", "value": 0},
+        {"op": "copy", "from": "/a", "path": "/e"},
+        {"op": "move", "from": "/d", "path": "/f"},
+        {"op": "replace", "path": "/e/b~0c/1", "value": 9},
+        {"op": "test", "path": "/f", "value": 1},
+    ]
+    expected = {"a": {"b~c": [0, 1, 2, 3]}, "e": {"b~c": [0, 9, 2, 3]}, "f": 1}
+    assert patch_json(path, operations) == expected
+    assert read_json(path) == expected
+    with pytest.raises(ValueError):
+        patch_json(
+            path, [{"op": "remove", "path": "/f"}, {"op": "remove", "path": "/x"}]
+        )
+    assert read_json(path) == expected
+    assert apply_patch({}, [{"op": "replace", "path": "", "value": [1]}]) == [1]
+
+
+def test_json_transaction(base):
+    import fcntl
+
+    path = join(base["tmp"], base["files"][1])
+    with json_transaction(path) as data:
+        data["counter"] = 1
+    with pytest.raises(KeyError):
+        with json_transaction(path, timeout=1) as data:
+            data["counter"] = 2
+            raise KeyError
+    with json_transaction(path, shared=True) as data:
+        assert data == {"counter": 1}
+    with open(f"{path}.lock") as holder:
+        fcntl.flock(holder, fcntl.LOCK_SH)
+        with json_transaction(path, shared=True, timeout=0.1) as data:
+            assert data == {"counter": 1}
+        with pytest.raises(TimeoutError):
+            with json_transaction(path, timeout=0.1, retry_interval=0.01):
+                pass
+
+
+def test_json_journal(base):
+    path = join(base["tmp"], base["files"][1])
+    journal = JsonJournal(path, compact_every=3)
+    journal.patch([{"op": "add", "path": "/items", "value": []}])
+    journal.patch([{"op": "add", "path": "/items/-", "value": 1}])
+    assert read_json(path) == {}
+    assert JsonJournal(path).read() == {"items": [1]}
+    journal.patch([{"op": "add", "path": "/items/-", "value": 2}])
+    assert read_json(path) == {"items": [1, 2]}
+    journal.patch([{"op": "add", "path": "/items/-", "value": 3}])
+    with pytest.raises(ValueError):
+        journal.patch([{"op": "remove", "path": "/missing"}])
+    with open(journal.journal, "a") as f:
+        f.write('[{"op": "add", "pa')
+    assert JsonJournal(path).read() == {"items": [1, 2, 3]}
+    # A journal older than the document is discarded.
+    with open(journal.journal, "a") as f:
+        f.write('[{"op": "remove", "path": "/items"}]\n')
+    create_json({"items": []}, path, force=True, atomic=True)
+    assert JsonJournal(path).read() == {"items": []}
+
+
+def test_toml_get_set(base):
+    path = join(base["tmp"], "pyproject.toml")
+    create_file('# Project\n[tool.poetry]\nversion = "0.1.0" # current\n', path)
+    key = ("tool", "poetry", "version")
+    assert toml_get(path, key) == "0.1.0"
+    assert toml_get(path, ("tool", "a", "b", "c"), None, cache=True) is None
+    with pytest.raises(KeyError):
+        toml_get(path, ("tool", "poetry", "version", "x"))
+    assert toml_set(path, key, "0.1.0", cache=True) is False
+    assert toml_set(path, key, "0.2.0") is True
+    assert toml_set(path, ("tool", "a", "b", "c"), [1, 2]) is True
+    assert toml_set(path, ("tool", "a", "b", "c"), [1, 2], cache=True) is False
+    assert toml_get(path, ("tool", "a", "b", "c"), cache=True) == (1, 2)
+    assert read_file(path).startswith(
+        '# Project\n[tool.poetry]\nversion = "0.2.0" # current\n'
+    )
+    eqversion(path, "0.3.0")
+    assert toml_get(path, key) == "0.3.0"
+
+
 def test_error_extension_create_json(base):
     content = {"Hello": "World!"}
     with pytest.raises(Exception):
         assert create_json(content, join(base["tmp"], base["files"][0]))  # file.txt
 
 
+def test_remove_trees(base):
+    root = str(base["tmp"])
+    kept = join(root, "kept")
+    create_path(kept)
+    for name in ("a/b/c", "a/d", "e"):
+        create_path(join(root, name))
+        create_file(name, join(root, name, "file.txt"))
+    os.symlink(kept, join(root, "a", "b", "link"))
+    create_file("root", join(root, "root.txt"))
+    missing = join(root, "missing")
+    errors = remove_trees(
+        join(root, "a"), join(root, "root.txt"), missing, max_workers=2
+    )
+    assert list(errors) == [missing]
+    assert isinstance(errors[missing], FileNotFoundError)
+    assert sorted(os.listdir(root)) == ["e", "kept"]
+    create_path(join(root, "f", "g"))
+    create_file("locked", join(root, "f", "g", "locked.txt"))
+    create_path(join(root, "f", "h"))
+    unlink = os.unlink
+
+    def locked(path, *args, **kwargs):
+        if path == "locked.txt":
+            raise PermissionError(path)
+        return unlink(path, *args, **kwargs)
+
+    with patch("snakypy.helpers.os.removals.unlink", locked):
+        errors = remove_trees(join(root, "f"))
+    assert list(errors) == [join(root, "f", "g", "locked.txt")]
+    assert os.listdir(join(root, "f")) == ["g"]
+    with patch("snakypy.helpers.os.removals.unlink", locked):
+        with pytest.raises(OSError, match="locked.txt"):
+            cleaner(root, level=2)
+    assert sorted(os.listdir(root)) == ["f"]
+    create_path(join(root, "e"), kept)
+    # A folder replaced by a link after it was read is not followed by its subfolders.
+    from snakypy.helpers.os import removals
+
+    create_path(join(root, "s", "t", "u"), join(kept, "u"))
+    create_file("kept", join(kept, "u", "kept.txt"))
+
+    class SwappedFolder(removals._Folder):
+        def __init__(self, path, *args):
+            if path == join(root, "s", "t", "u"):
+                os.rename(join(root, "s", "t"), join(root, "s", "moved"))
+                os.symlink(kept, join(root, "s", "t"))
+            super().__init__(path, *args)
+
+    with patch.object(removals, "_Folder", SwappedFolder):
+        errors = remove_trees(join(root, "s"))
+    assert os.listdir(join(kept, "u")) == ["kept.txt"]
+    assert sorted(os.listdir(join(root, "s"))) == ["moved", "t"]
+    os.unlink(join(root, "s", "t"))
+    remove_trees(join(root, "s"), join(kept, "u"))
+    create_file("root", join(root, "root.txt"))
+    assert cleaner(root, level=2) == 2
+    assert os.listdir(root) == ["root.txt"]
+
+
+def test_remove_trees_file_limit(base):
+    resource = pytest.importorskip("resource")
+    tree = join(base["tmp"], "tree")
+    for index in range(300):
+        create_path(join(tree, f"d{index}", "s", "t"))
+        create_file("f", join(tree, f"d{index}", "s", "t", "f"))
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # Only one descriptor per thread is open, however wide the tree is.
+    resource.setrlimit(resource.RLIMIT_NOFILE, (64, hard))
+    try:
+        errors = remove_trees(tree, max_workers=8)
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert errors == {}
+    assert not exists(tree)
+
+
+def test_walk_entries(base):
+    root = str(base["tmp"])
+    create_path(join(root, "a", "b"), join(root, "c"))
+    create_file("x", join(root, "a", "x.txt"))
+    os.symlink(join(root, "a"), join(root, "link"))
+    expected = [(r, sorted(d), sorted(f)) for r, d, f in os.walk(root)]
+    found = [
+        (r, sorted(e.name for e in d), sorted(e.name for e in f))
+        for r, d, f in walk_entries(root)
+    ]
+    assert found == expected
+
+
 def test_cleaner_not_found_object(base):
     with pytest.raises(FileNotFoundError):
         cleaner(base["tmp"], "foo.txt")
@@ -114,6 +659,20 @@ def test_tools_requirements():
         tools_requirements("ls__")
 
 
+def test_find_tools(base, monkeypatch):
+    from shutil import which
+
+    bin_dir = str(base["tmp"].mkdir("bin"))
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    data = find_tools("ls", "snakypy_tool")
+    assert data == {"found": {"ls": which("ls")}, "missing": ["snakypy_tool"]}
+    tool = join(bin_dir, "snakypy_tool")
+    create_file("#!/bin/sh\n", tool)
+    os.chmod(tool, 0o755)
+    assert find_tools("snakypy_tool")["found"] == {"snakypy_tool": tool}
+    assert is_tool("snakypy_tool") is True
+
+
 def test_systemctl_is_active():
     ret = systemctl_is_active("systemd-udevd.service")
     if "inactive" or "active" in ret[0]:
@@ -213,6 +772,190 @@ def test_find_extension(base):
     assert json_path in data["by_extension"]
 
 
+def test_find_extension_single_pass(base):
+    create_path(join(base["tmp"], "a", "b"), join(base["tmp"], "c"))
+    names = ("a/one.txt", "a/b/two.json", "c/three.tar.gz", "four.gz", "five.md")
+    for name in names:
+        create_file(name, join(base["tmp"], name), force=True)
+    expected = []
+    for ext in ("txt", "gz", "tar.gz"):
+        for root_, directory_, files_ in os.walk(base["tmp"]):
+            expected.extend(join(root_, f) for f in files_ if f.endswith(ext))
+    data = find_objects(base["tmp"], by_extension=("txt", "gz", "tar.gz"))
+    assert data["by_extension"] == expected
+
+
+def test_find_objects_parallel(base):
+    create_path(*(join(base["tmp"], f"d{i}", "sub") for i in range(4)))
+    for index in range(4):
+        create_file("txt", join(base["tmp"], f"d{index}", "sub", "a.txt"), force=True)
+        create_file("log", join(base["tmp"], f"d{index}", "b.log"), force=True)
+    test_create_file(base)
+    test_create_json(base)
+    options = dict(files=("file.txt",), folders=("d1",), by_extension=("txt", "log"))
+    expected = find_objects(base["tmp"], **options)
+    assert find_objects_parallel(base["tmp"], max_workers=2, **options) == expected
+    assert find_objects_parallel(base["tmp"], processes=True, **options) == expected
+    errors: list = []
+    missing = join(base["tmp"], "missing")
+    data = find_objects_parallel(
+        missing, base["tmp"], by_extension=("log",), onerror=errors.append
+    )
+    assert len(data["by_extension"]) == 4
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+def test_find_objects_parallel_timeout(base):
+    from snakypy.helpers.catches import finders
+
+    scan_root = finders._scan_root
+
+    def slow_scan_root(directory, *args):
+        if str(directory).endswith("slow"):
+            time.sleep(0.5)
+        return scan_root(directory, *args)
+
+    slow = join(base["tmp"], "slow")
+    create_path(slow)
+    create_file("log", join(base["tmp"], "a.log"), force=True)
+    errors: list = []
+    with patch.object(finders, "_scan_root", slow_scan_root):
+        started = time.monotonic()
+        data = find_objects_parallel(
+            slow, base["tmp"], by_extension=("log",), timeout=0.2, onerror=errors.append
+        )
+    # The first level of the roots is also limited by the timeout.
+    assert time.monotonic() - started < 0.4
+    assert data["by_extension"] == [join(base["tmp"], "a.log")]
+    assert [str(error) for error in errors] == [f"Scan timed out: {slow}"]
+
+
+def test_find_objects_index(base):
+    index_path = join(base["tmp"], "index.sqlite3")
+    tree = join(base["tmp"], "tree")
+    create_path(join(tree, "a", "b"), join(tree, "c"))
+    create_file("txt", join(tree, "a", "b", "one.txt"), force=True)
+    for root_, directory_, files_ in os.walk(tree):
+        os.utime(root_, (1, 1))
+    expected = find_objects(tree, by_extension=("txt",))
+    assert index_rebuild(tree, index_path) == 4
+    data = find_objects(tree, by_extension=("txt",), index=True, index_path=index_path)
+    assert data == expected
+    # A listing with the same mtime is served from the index.
+    create_file("txt", join(tree, "a", "b", "hidden.txt"), force=True)
+    os.utime(join(tree, "a", "b"), (1, 1))
+    data = find_objects(tree, by_extension=("txt",), index=True, index_path=index_path)
+    assert data == expected
+    create_file("txt", join(tree, "c", "two.txt"), force=True)
+    remove_objects(objects=(join(tree, "a"),))
+    data = find_objects(tree, by_extension=("txt",), index=True, index_path=index_path)
+    assert data["by_extension"] == [join(tree, "c", "two.txt")]
+    index_invalidate(tree, index_path)
+    data = find_objects(tree, by_extension=("txt",), index=True, index_path=index_path)
+    assert data["by_extension"] == [join(tree, "c", "two.txt")]
+    # The index is not locked while a walk is in progress.
+    walker = indexed_walk(tree, index_path=index_path)
+    next(walker)
+    data = find_objects(tree, by_extension=("txt",), index=True, index_path=index_path)
+    assert data["by_extension"] == [join(tree, "c", "two.txt")]
+    index_invalidate(tree, index_path)
+    walker.close()
+    # The names that are not valid UTF-8 are stored too.
+    if platform.system() == "Linux":
+        name = os.fsdecode(b"\xff.txt")
+        create_file("txt", join(tree, "c", name), force=True)
+        for _ in range(2):
+            data = find_objects(
+                tree, by_extension=("txt",), index=True, index_path=index_path
+            )
+            assert sorted(data["by_extension"]) == sorted(
+                [join(tree, "c", "two.txt"), join(tree, "c", name)]
+            )
+        os.remove(join(tree, "c", name))
+    # An index that cannot be read falls back to the walk of the disk.
+    damaged = join(base["tmp"], "damaged.sqlite3")
+    create_file("not a database" * 100, damaged, force=True)
+    data = find_objects(tree, by_extension=("txt",), index=True, index_path=damaged)
+    assert data["by_extension"] == [join(tree, "c", "two.txt")]
+
+
+def test_find_objects_filters(base):
+    create_path(
+        join(base["tmp"], ".git", "objects"),
+        join(base["tmp"], "src", "node_modules", "pkg"),
+        join(base["tmp"], "build"),
+    )
+    names = (
+        ".git/objects/a.py",
+        "src/node_modules/pkg/b.py",
+        "src/c.py",
+        "src/test_c.py",
+        "build/d.py",
+        "e.py",
+    )
+    for name in names:
+        create_file("py", join(base["tmp"], name), force=True)
+    ignore_file = join(base["tmp"], "ignore")
+    create_file("# Comment\n\n/build/\ntest_*\n!src/test_c.py\n", ignore_file)
+    filters = PathFilter(
+        exclude=(".git", "node_modules/"),
+        exclude_regex=(r"^e\.",),
+        ignore_files=(ignore_file,),
+    )
+    data = find_objects(base["tmp"], by_extension=("py",), filters=filters)
+    assert sorted(data["by_extension"]) == [
+        join(base["tmp"], "src", "c.py"),
+        join(base["tmp"], "src", "test_c.py"),
+    ]
+    filters = PathFilter(include=("src/**",), exclude=("node_modules",))
+    data = find_objects_parallel(base["tmp"], by_extension=("py",), filters=filters)
+    assert len(data["by_extension"]) == 2
+    assert not filters.excluded("node_modules/pkg")
+    assert filters.excluded("node_modules", is_dir=True)
+    # The regular expressions keep their own groups and backreferences.
+    filters = PathFilter(
+        exclude=("!src/aa.py",),
+        include_regex=(r"(?P<p0>[a-z])(?P=p0)",),
+        exclude_regex=(r"(a)\1",),
+    )
+    assert filters.excluded("src/aa.py")
+    assert filters.included("src/bb.py")
+    assert not filters.included("src/ab.py")
+
+
+def test_iter_objects_limit_and_until(base):
+    for index in range(10):
+        create_file("log", join(base["tmp"], f"file{index}.log"), force=True)
+    test_create_json(base)
+    matches = list(iter_objects(base["tmp"], by_extension=("log",), limit=3))
+    assert len(matches) == 3
+    assert all(m.kind == "by_extension" and m.extension == "log" for m in matches)
+    matches = list(
+        iter_objects(
+            base["tmp"],
+            files=("file.json",),
+            by_extension=("log", "json"),
+            until=lambda m: m.kind == "files",
+        )
+    )
+    assert matches == [("files", join(base["tmp"], "file.json"), None)]
+
+
+def test_extension_histogram(base):
+    create_path(join(base["tmp"], "sub"))
+    create_file("12345", join(base["tmp"], "sub", "a.tar.gz"), force=True)
+    create_file("123", join(base["tmp"], "b.gz"), force=True)
+    create_file("1", join(base["tmp"], ".bashrc"), force=True)
+    data = extension_histogram(base["tmp"], by_extension=("gz", "tar.gz", "txt"))
+    assert data == {
+        "gz": {"count": 2, "size": 8},
+        "tar.gz": {"count": 1, "size": 5},
+        "txt": {"count": 0, "size": 0},
+    }
+    data = extension_histogram(base["tmp"])
+    assert data == {"gz": {"count": 2, "size": 8}, "": {"count": 1, "size": 1}}
+
+
 def test_find_files(base):
     test_create_file(base)
     test_create_json(base)
@@ -264,6 +1007,13 @@ def test_file_extension():
     assert extension(file, dots=True) == "tar.gz"
 
 
+def test_file_extensions_batch():
+    files = ["/home/file.tar.gz", "None", "/home/.bashrc", None, "/home/a.b/c"]
+    assert extensions(files) == [".gz", None, None, None, None]
+    assert extensions(files, dots=True) == ["tar.gz", None, None, None, "b/c"]
+    assert extensions(iter(files[:1])) == [extension(files[0])]
+
+
 def test_command_real_time():
     assert command("ls", ret=True, verbose=True) == 0
 
@@ -305,6 +1055,22 @@ def test_rmdir_blank(base):
         assert os.path.isdir(path) is False
 
 
+def test_rmdir_blank_chains(base):
+    root = str(base["tmp"])
+    create_path(join(root, "a", "b", "c"), join(root, "a", "d"), join(root, "e", "f"))
+    create_file("keep", join(root, "e", "file.txt"))
+    os.symlink(join(root, "missing"), join(root, "e", "f", "link"))
+    chain = [join(root, "a", "d"), join(root, "a", "b", "c"), join(root, "a", "b")]
+    expected = sorted(chain + [join(root, "a")])
+    assert sorted(rmdir_blank(root, dry_run=True)) == expected
+    assert os.path.isdir(join(root, "a", "b", "c"))
+    removed = rmdir_blank(root)
+    assert sorted(removed) == expected
+    assert removed[-1] == join(root, "a")
+    assert sorted(os.listdir(root)) == ["e"]
+    assert rmdir_blank(root) == []
+
+
 # def test_super_command(base):
 #     from snakypy.helpers.subprocess import super_command
 #